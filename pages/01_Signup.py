@@ -80,7 +80,9 @@ with col2:
             cancel_button = st.form_submit_button("Cancel")
 
         if create_button:
-            if password != confirm_password:
+            if not email.strip():
+                st.error("Please enter an email address.")
+            elif password != confirm_password:
                 st.error("Passwords do not match!")
             elif len(password) < 6:
                 st.error("Password must be at least 6 characters.")
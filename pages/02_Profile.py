@@ -24,6 +24,10 @@ hide_streamlit_style = """
             """
 st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 
+@st.cache_data(max_entries=16)
+def cached_bmi_fig(bmi, status):
+    return create_bmi_chart(bmi, status)
+
 def main():
     st.title("📝 User Profile")
     sidebar(current_page="📝 Profile")
@@ -87,7 +91,7 @@ def display_existing_profile(user_data):
     bmi = user_data.get('bmi', 0)
     status = user_data.get('health_status', 'Unknown')
     
-    bmi_fig = create_bmi_chart(bmi, status)
+    bmi_fig = cached_bmi_fig(bmi, status)
     st.plotly_chart(bmi_fig, use_container_width=True)
     
     # Add info about BMI ranges
@@ -223,10 +223,11 @@ def main():
     search_query = st.text_input("Search for a food:", placeholder="e.g., chicken, apple, rice")
     
     if search_query:
-        # Filter foods based on query
+        # Filter foods based on query against the names lowercased at load time
+        # (plain substring match, so characters like '(' are safe)
         query_lower = search_query.lower()
         filtered_foods = st.session_state.food_data[
-            st.session_state.food_data["Food Name"].str.lower().str.contains(query_lower, na=False)
+            st.session_state.food_data['_name_lc'].str.contains(query_lower, regex=False, na=False)
         ]
         
         if filtered_foods.empty:
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from utils.recommendations import recommend_exercises, get_form_points, get_exercise_recommendation_plan, calculate_body_fat_percentage, load_user_ratings, save_user_ratings
 from utils.user_management import get_user
 from utils.visualization import create_exercise_distribution_chart
@@ -22,6 +23,29 @@ hide_streamlit_style = """
             """
 st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 
+# Equipment variation lists by exercise category
+EQUIPMENT_VARIATIONS = {
+    'Strength': """
+        - Bodyweight version
+        - Dumbbell variation
+        - Resistance band option
+        - Barbell variation (if applicable)
+        - Cable machine alternative
+        """,
+    'Cardio': """
+        - No equipment version
+        - With resistance bands
+        - Using cardio machines
+        - With weights for added challenge
+        """,
+    'Flexibility': """
+        - Without equipment
+        - Using resistance bands
+        - With foam roller
+        - Using yoga props
+        """
+}
+
 def main():
     st.title("🏋️ Exercise Recommendations")
     sidebar(current_page="🍽️ Meal Planner")
@@ -113,15 +137,24 @@ def main():
         # Add search button
         search_button = st.button("Search Exercises")
         
-        # Display filtered exercises only if search button is clicked
+        # Run the search when the button is clicked and keep the results in session
+        # state, so later reruns (e.g. after saving a rating) don't search again
+        search_query = (search_term, filter_type, filter_level)
         if search_button:
-            # Filter exercises
-            filtered_df = filter_exercises(
-                st.session_state.exercise_data,
-                search_term,
-                filter_type,
-                filter_level
-            )
+            st.session_state.exercise_library_search = {
+                "query": search_query,
+                "results": cached_filter_exercises(
+                    st.session_state.exercise_data,
+                    search_term,
+                    filter_type,
+                    filter_level
+                )
+            }
+        
+        # Display filtered exercises only while the inputs match the last search
+        library_search = st.session_state.get("exercise_library_search")
+        if library_search and library_search["query"] == search_query:
+            filtered_df = library_search["results"]
             
             # Display filtered exercises
             if not filtered_df.empty:
@@ -156,29 +189,35 @@ def filter_exercises(exercise_data, search_term, filter_type, filter_level):
     """
     if exercise_data.empty:
         return pd.DataFrame()
-    
-    # Start with all exercises
-    filtered_df = exercise_data.copy()
-    
+
+    # Build one combined mask so the frame is only materialized once
+    mask = pd.Series(True, index=exercise_data.index)
+
     # Apply type filter
     if filter_type != "All":
-        filtered_df = filtered_df[filtered_df['Type'] == filter_type]
-    
+        mask &= exercise_data['Type'] == filter_type
+
     # Apply level filter
     if filter_level != "All":
-        filtered_df = filtered_df[filtered_df['Level'] == filter_level]
-    
-    # Apply search filter
+        mask &= exercise_data['Level'] == filter_level
+
+    # Apply search filter (literal match, so user input is never parsed as a regex)
     if search_term:
-        search_mask = (
-            filtered_df['Title'].str.contains(search_term, case=False, na=False) |
-            filtered_df['BodyPart'].str.contains(search_term, case=False, na=False) |
-            filtered_df['Equipment'].str.contains(search_term, case=False, na=False) |
-            filtered_df['Desc'].str.contains(search_term, case=False, na=False)
+        mask &= (
+            exercise_data['Title'].str.contains(search_term, case=False, regex=False, na=False) |
+            exercise_data['BodyPart'].str.contains(search_term, case=False, regex=False, na=False) |
+            exercise_data['Equipment'].str.contains(search_term, case=False, regex=False, na=False) |
+            exercise_data['Desc'].str.contains(search_term, case=False, regex=False, na=False)
         )
-        filtered_df = filtered_df[search_mask]
-    
-    return filtered_df
+
+    return exercise_data[mask]
+
+@st.cache_data(hash_funcs={pd.DataFrame: id}, max_entries=32)
+def cached_filter_exercises(exercise_data, search_term, filter_type, filter_level):
+    """
+    Cached filter_exercises, keyed on the identity of the exercise DataFrame and the search inputs
+    """
+    return filter_exercises(exercise_data, search_term, filter_type, filter_level)
 
 def display_exercise_content(exercise, context_id, user_data=None):
     """
@@ -188,22 +227,33 @@ def display_exercise_content(exercise, context_id, user_data=None):
         st.warning("Exercise details not available")
         return
     
+    # Resolve the fields used by several helpers once per card
+    exercise_name = exercise.get('name', exercise.get('Title', 'Unknown'))
+    exercise_type = exercise.get('type', exercise.get('Type', ''))
+    level = exercise.get('level', exercise.get('Level', ''))
+    rating_key = f"rating_{exercise_name}_{context_id}"
+    saved_rating_key = f"saved_rating_{exercise_name}_{context_id}"
+    
     # Create two columns for layout
     col1, col2 = st.columns([3, 2])
     
     with col1:
-        # Main exercise information
-        st.markdown(f"#### {exercise.get('name', exercise.get('Title', 'Unknown'))}")
-        st.markdown(f"**Type:** {exercise.get('type', exercise.get('Type', 'Unknown'))}")
-        st.markdown(f"**Body Part:** {exercise.get('main_muscle', exercise.get('BodyPart', 'Unknown'))}")
-        st.markdown(f"**Equipment:** {exercise.get('equipment', exercise.get('Equipment', 'None'))}")
-        st.markdown(f"**Level:** {exercise.get('level', exercise.get('Level', 'Unknown'))}")
+        # Main exercise information, rendered as a single markdown block
+        info_lines = [
+            f"#### {exercise_name}",
+            f"**Type:** {exercise.get('type', exercise.get('Type', 'Unknown'))}",
+            f"**Body Part:** {exercise.get('main_muscle', exercise.get('BodyPart', 'Unknown'))}",
+            f"**Equipment:** {exercise.get('equipment', exercise.get('Equipment', 'None'))}",
+            f"**Level:** {exercise.get('level', exercise.get('Level', 'Unknown'))}"
+        ]
         
-        # Description
-        if exercise.get('description', exercise.get('Desc')):
-            st.markdown("**Exercise Description**")
-            with st.container():
-                st.markdown(exercise.get('description', exercise.get('Desc', '')))
+        # Description (missing ones load from the CSV as NaN)
+        description = exercise.get('description', exercise.get('Desc'))
+        if isinstance(description, str) and description.strip():
+            info_lines.append("**Exercise Description**")
+            info_lines.append(description)
+        
+        st.markdown("\n\n".join(info_lines))
     
     with col2:
         # Rating and parameters
@@ -218,9 +268,6 @@ def display_exercise_content(exercise, context_id, user_data=None):
             st.info(rating_desc)
         
         # User Rating
-        exercise_name = exercise.get('name', exercise.get('Title', 'Unknown'))
-        rating_key = f"rating_{exercise_name}_{context_id}"
-        saved_rating_key = f"saved_rating_{exercise_name}_{context_id}"
         if saved_rating_key not in st.session_state:
             ratings_df = load_user_ratings()
             existing_rating = ratings_df[(ratings_df['user_id'] == st.session_state.get('current_user', 'demo_user')) & 
@@ -231,26 +278,14 @@ def display_exercise_content(exercise, context_id, user_data=None):
         st.markdown(f"**User Rating:** {user_rating}<span style='font-size: smaller'>/5</span> {user_stars}", unsafe_allow_html=True)
         
         # Display exercise parameters based on level
-        level = exercise.get('level', exercise.get('Level', '')).lower()
         st.markdown("### Exercise Parameters")
-        
-        if 'beginner' in level:
-            display_level_parameters('low')
-        elif 'expert' in level:
-            display_level_parameters('high')
-        else:
-            display_level_parameters('moderate')
+        display_level_parameters(get_level_intensity(level))
     
     # Exercise tips and form guidance
     st.markdown("---")
     st.markdown("**Form & Safety Tips**")
     with st.container():
-        display_exercise_tips(exercise)
-
-    # Store and manage rating in session state
-    exercise_name = exercise.get('name', exercise.get('Title', 'Unknown'))
-    rating_key = f"rating_{exercise_name}_{context_id}"
-    saved_rating_key = f"saved_rating_{exercise_name}_{context_id}"
+        display_exercise_tips(exercise_type)
 
     # Initialize saved rating in session state if not present
     if saved_rating_key not in st.session_state:
@@ -290,6 +325,8 @@ def display_exercise_details(exercise, user_data=None):
         st.warning("Exercise details not available")
         return
     
+    exercise_type = exercise['Type']
+    
     # Create tabs for different aspects of the exercise
     tabs = st.tabs(["Overview", "Instructions", "Form & Technique", "Variations"])
     
@@ -297,18 +334,18 @@ def display_exercise_details(exercise, user_data=None):
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            st.markdown(f"### {exercise['Title']}")
-            st.markdown(f"**Type:** {exercise['Type']}")
+            overview_lines = [f"### {exercise['Title']}", f"**Type:** {exercise['Type']}"]
             # Add appropriate icons based on exercise type
             if 'Stretching' in exercise['Type']:
-                st.markdown("🧘‍♂️ **Flexibility & Mobility**")
+                overview_lines.append("🧘‍♂️ **Flexibility & Mobility**")
             elif any(x in exercise['Type'] for x in ['Cardio', 'HIIT']):
-                st.markdown("🏃‍♂️ **Cardiovascular Exercise**")
+                overview_lines.append("🏃‍♂️ **Cardiovascular Exercise**")
             elif any(x in exercise['Type'] for x in ['Strength', 'Olympic Weightlifting', 'Plyometrics', 'Powerlifting', 'Strongman']):
-                st.markdown("💪 **Strength Training**")
-            st.markdown(f"**Body Part:** {exercise['BodyPart']}")
-            st.markdown(f"**Equipment:** {exercise['Equipment']}")
-            st.markdown(f"**Level:** {exercise['Level']}")
+                overview_lines.append("💪 **Strength Training**")
+            overview_lines.append(f"**Body Part:** {exercise['BodyPart']}")
+            overview_lines.append(f"**Equipment:** {exercise['Equipment']}")
+            overview_lines.append(f"**Level:** {exercise['Level']}")
+            st.markdown("\n\n".join(overview_lines))
             
             dataset_rating = exercise.get('Rating')
             if pd.notna(dataset_rating):
@@ -321,8 +358,7 @@ def display_exercise_details(exercise, user_data=None):
         with col2:
             # Display exercise parameters based on level
             st.markdown("### Parameters")
-            level = exercise['Level'].lower()
-            display_level_parameters('high' if 'Expert' in level else 'low' if 'Beginner' in level else 'moderate')
+            display_level_parameters(get_level_intensity(exercise['Level']))
     
     with tabs[1]:  # Instructions
         st.markdown("### Exercise Instructions")
@@ -334,15 +370,33 @@ def display_exercise_details(exercise, user_data=None):
         
         # Common mistakes and corrections (removed expander, displayed directly)
         st.markdown("**Common Mistakes & Corrections:**")
-        display_common_mistakes(exercise['Type'])
+        display_common_mistakes(exercise_type)
     
     with tabs[2]:  # Form & Technique
         st.markdown("### Proper Form & Technique")
-        display_form_technique(exercise, user_data)
+        display_form_technique(exercise_type, user_data)
     
     with tabs[3]:  # Variations
         st.markdown("### Exercise Variations")
-        display_exercise_variations(exercise)
+        display_exercise_variations(exercise_type)
+
+@lru_cache(maxsize=32)
+def get_level_intensity(level):
+    """Map an exercise level to its parameter intensity ('low', 'moderate' or 'high')"""
+    level = level.lower()
+    if 'beginner' in level:
+        return 'low'
+    elif 'expert' in level:
+        return 'high'
+    return 'moderate'
+
+@lru_cache(maxsize=32)
+def classify_exercise_type(exercise_type, default='Flexibility'):
+    """Map an exercise type to 'Strength', 'Cardio' or 'Flexibility'"""
+    for category in ('Strength', 'Cardio', 'Flexibility'):
+        if category in exercise_type:
+            return category
+    return default
 
 def display_level_parameters(intensity):
     """Display exercise parameters based on intensity level"""
@@ -368,44 +422,42 @@ def display_level_parameters(intensity):
         - Intensity: 60-70% of max
         """)
 
-def display_exercise_tips(exercise):
+def display_exercise_tips(exercise_type):
     """Display exercise-specific tips and form guidance"""
-    st.markdown("**Key Points to Remember:**")
-    
     # General tips
-    general_tips = [
+    general_tips = (
         "Maintain proper breathing throughout",
         "Keep core engaged for stability",
         "Stop if you feel sharp or sudden pain"
-    ]
+    )
     
     # Exercise-specific tips based on type
-    specific_tips = get_exercise_specific_tips(exercise.get('type', exercise.get('Type', '')))
+    specific_tips = get_exercise_specific_tips(exercise_type)
     
-    # Display all tips
-    for tip in general_tips + specific_tips:
-        st.markdown(f"- {tip}")
+    # Display all tips in one block
+    st.markdown("**Key Points to Remember:**\n\n" + "\n".join(f"- {tip}" for tip in general_tips + specific_tips))
 
+@lru_cache(maxsize=32)
 def get_exercise_specific_tips(exercise_type):
     """Get tips specific to exercise type"""
     if 'Strength' in exercise_type:
-        return [
+        return (
             "Control the movement in both directions",
             "Keep proper alignment throughout",
             "Focus on mind-muscle connection"
-        ]
+        )
     elif 'Cardio' in exercise_type:
-        return [
+        return (
             "Stay hydrated",
             "Monitor your heart rate",
             "Maintain good posture"
-        ]
+        )
     else:  # Flexibility
-        return [
+        return (
             "Don't bounce in stretches",
             "Breathe deeply and regularly",
             "Hold stretches for recommended duration"
-        ]
+        )
 
 def display_common_mistakes(exercise_type):
     """Display common mistakes and corrections based on exercise type"""
@@ -428,31 +480,26 @@ def display_common_mistakes(exercise_type):
     }
     
     # Get relevant mistakes based on exercise type
-    mistakes = common_mistakes.get(
-        next((k for k in common_mistakes.keys() if k in exercise_type), 'Strength')
-    )
+    mistakes = common_mistakes[classify_exercise_type(exercise_type, default='Strength')]
     
-    for mistake in mistakes:
-        st.markdown(f"- {mistake}")
+    st.markdown("\n".join(f"- {mistake}" for mistake in mistakes))
 
-def display_form_technique(exercise, user_data=None):
+def display_form_technique(exercise_type, user_data=None):
     """Display form and technique guidance"""
     # Key form points
-    st.markdown("**Key Form Points:**")
-    exercise_type = exercise.get('type', exercise.get('Type', ''))
     form_points = get_form_points_by_type(exercise_type)  # Use local helper function
-    for point in form_points:
-        st.markdown(f"- {point}")
+    st.markdown("**Key Form Points:**\n\n" + "\n".join(f"- {point}" for point in form_points))
     
     # Breathing pattern
     st.markdown("**Breathing Pattern:**")
-    if 'Strength' in exercise_type:
+    category = classify_exercise_type(exercise_type)
+    if category == 'Strength':
         st.markdown("""
         - Exhale during exertion
         - Inhale during the easier phase
         - Maintain consistent rhythm
         """)
-    elif 'Cardio' in exercise_type:
+    elif category == 'Cardio':
         st.markdown("""
         - Maintain steady breathing
         - Match breath to movement
@@ -465,26 +512,27 @@ def display_form_technique(exercise, user_data=None):
         - Never hold your breath
         """)
 
+@lru_cache(maxsize=32)
 def get_form_points_by_type(exercise_type):
     """Get form points based on exercise type"""
     if 'Strength' in exercise_type:
-        return [
+        return (
             "Maintain a neutral spine",
             "Keep joints aligned",
             "Engage the target muscle group"
-        ]
+        )
     elif 'Cardio' in exercise_type:
-        return [
+        return (
             "Land softly to reduce impact",
             "Keep movements controlled",
             "Avoid overstriding"
-        ]
+        )
     else:  # Flexibility
-        return [
+        return (
             "Move into stretches slowly",
             "Avoid forcing the stretch",
             "Focus on the target area"
-        ]
+        )
 
 def display_exercise_recommendations(user_data):
     """
@@ -546,15 +594,10 @@ def display_exercise_recommendations(user_data):
         st.error(exercise_recommendations["error"])
         return
     
-    # Apply filters from user_data
-    filtered_recommendations = {
-        'Strength': [],
-        'Cardio': [],
-        'Flexibility': []
-    }
+    rec_df = exercise_recommendations["df"]
     
     # Display distribution chart
-    dist_fig = create_exercise_distribution_chart(exercise_recommendations)
+    dist_fig = create_exercise_distribution_chart(rec_df)
     st.plotly_chart(dist_fig, use_container_width=True)
     
     # Display weekly schedule suggestion
@@ -563,42 +606,27 @@ def display_exercise_recommendations(user_data):
     # Create tabs for days of the week
     day_tabs = st.tabs(["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"])
     
-    # Organize strength exercises by muscle group first to ensure diversity
-    upper_body_exercises = []
-    core_exercises = []
-    lower_body_exercises = []
-    
-    if 'Strength' in exercise_recommendations and exercise_recommendations['Strength']:
-        for exercise in exercise_recommendations['Strength']:
-            main_muscle = exercise.get('main_muscle', '').lower()
-            
-            if any(muscle in main_muscle for muscle in ['shoulders', 'chest', 'upper back', 'lats', 'biceps', 'triceps', 'forearms', 'trapezius']):
-                upper_body_exercises.append(exercise)
-            elif any(muscle in main_muscle for muscle in ['quadriceps', 'hamstrings', 'glutes', 'calves', 'adductors', 'abductors']):
-                lower_body_exercises.append(exercise)
-            elif any(muscle in main_muscle for muscle in ['abdominals', 'obliques', 'lower back', 'core']):
-                core_exercises.append(exercise)
-            else:
-                upper_body_exercises.append(exercise)
+    # Split recommendations by category, and strength exercises by muscle bucket
+    strength_df = rec_df[rec_df['category'] == 'Strength']
+    cardio_df = rec_df[rec_df['category'] == 'Cardio']
+    flexibility_df = rec_df[rec_df['category'] == 'Flexibility']
+    upper_body_df = strength_df[strength_df['bucket'] == 'upper']
+    core_df = strength_df[strength_df['bucket'] == 'core']
+    lower_body_df = strength_df[strength_df['bucket'] == 'lower']
     
     # Assign different exercise types to different days based on user goal
     with day_tabs[0]:  # Monday - Upper Body
         st.markdown("### Upper Body Strength")
-        if upper_body_exercises:
+        if not upper_body_df.empty:
             # Limit to 3 exercises for the day
-            display_exercises = upper_body_exercises[:3]
-            for i, exercise in enumerate(display_exercises):
-                with st.expander(f"{i+1}. {exercise['name']} - {exercise['main_muscle']}"):
-                    display_exercise_content(exercise, context_id=f"monday_{i}", user_data=user_data)
+            display_exercise_expanders(upper_body_df.head(3), "monday", user_data)
         else:
             st.info("No upper body exercises available.")
     
     with day_tabs[1]:  # Tuesday - Cardio
         st.markdown("### Cardio Focus")
-        if 'Cardio' in exercise_recommendations and exercise_recommendations['Cardio']:
-            for i, exercise in enumerate(exercise_recommendations['Cardio'][:3]):
-                with st.expander(f"{i+1}. {exercise['name']} - {exercise['main_muscle']}"):
-                    display_exercise_content(exercise, context_id=f"tuesday_{i}", user_data=user_data)
+        if not cardio_df.empty:
+            display_exercise_expanders(cardio_df.head(3), "tuesday", user_data)
         else:
             st.info("No cardio exercises available.")
     
@@ -606,63 +634,41 @@ def display_exercise_recommendations(user_data):
         st.markdown("### Core Strength & Flexibility")
         
         # First display core exercises
-        core_display_count = min(2, len(core_exercises))
+        core_display_count = min(2, len(core_df))
         if core_display_count > 0:
-            for i, exercise in enumerate(core_exercises[:core_display_count]):
-                with st.expander(f"{i+1}. {exercise['name']} - {exercise['main_muscle']}"):
-                    display_exercise_content(exercise, context_id=f"wednesday_core_{i}", user_data=user_data)
+            display_exercise_expanders(core_df.head(core_display_count), "wednesday_core", user_data)
         
         # Then add some flexibility exercises
         flex_display_count = 3 - core_display_count
-        if 'Flexibility' in exercise_recommendations and exercise_recommendations['Flexibility'] and flex_display_count > 0:
-            for i, exercise in enumerate(exercise_recommendations['Flexibility'][:flex_display_count]):
-                with st.expander(f"{i+1 + core_display_count}. {exercise['name']} - {exercise['main_muscle']}"):
-                    display_exercise_content(exercise, context_id=f"wednesday_flex_{i}", user_data=user_data)
+        if not flexibility_df.empty and flex_display_count > 0:
+            display_exercise_expanders(flexibility_df.head(flex_display_count), "wednesday_flex", user_data, start=core_display_count)
         
         if core_display_count == 0 and flex_display_count == 0:
             st.info("No core or flexibility exercises available.")
     
     with day_tabs[3]:  # Thursday - Lower Body
         st.markdown("### Lower Body Strength")
-        if lower_body_exercises:
+        if not lower_body_df.empty:
             # Limit to 3 exercises for the day
-            display_exercises = lower_body_exercises[:3]
-            for i, exercise in enumerate(display_exercises):
-                with st.expander(f"{i+1}. {exercise['name']} - {exercise['main_muscle']}"):
-                    display_exercise_content(exercise, context_id=f"thursday_{i}", user_data=user_data)
+            display_exercise_expanders(lower_body_df.head(3), "thursday", user_data)
         else:
             st.info("No lower body exercises available.")
     
     with day_tabs[4]:  # Friday - Full Body Circuit
         st.markdown("### Full Body Circuit")
-        exercises = []
-        
-        # Try to get one from each category (upper, lower, core, cardio)
-        if upper_body_exercises:
-            exercises.append(upper_body_exercises[0])
-        if lower_body_exercises:
-            exercises.append(lower_body_exercises[0])
-        if core_exercises:
-            exercises.append(core_exercises[0])
-        if 'Cardio' in exercise_recommendations and exercise_recommendations['Cardio']:
-            exercises.append(exercise_recommendations['Cardio'][0])
-        
-        # Limit to 4 max exercises
-        exercises = exercises[:4]
         
-        for i, exercise in enumerate(exercises):
-            with st.expander(f"{i+1}. {exercise['name']} - {exercise['main_muscle']}"):
-                display_exercise_content(exercise, context_id=f"friday_{i}", user_data=user_data)
+        # Try to get one from each category (upper, lower, core, cardio), 4 max
+        circuit_df = pd.concat([upper_body_df.head(1), lower_body_df.head(1), core_df.head(1), cardio_df.head(1)])
         
-        if not exercises:
+        if not circuit_df.empty:
+            display_exercise_expanders(circuit_df, "friday", user_data)
+        else:
             st.info("No exercises available.")
     
     with day_tabs[5]:  # Saturday
         st.markdown("### Active Recovery")
-        if 'Flexibility' in exercise_recommendations and exercise_recommendations['Flexibility']:
-            for i, exercise in enumerate(exercise_recommendations['Flexibility'][3:6]):
-                with st.expander(f"{i+1}. {exercise['name']} - {exercise['main_muscle']}"):
-                    display_exercise_content(exercise, context_id=f"saturday_{i}", user_data=user_data)
+        if not flexibility_df.empty:
+            display_exercise_expanders(flexibility_df.iloc[3:6], "saturday", user_data)
         else:
             st.info("No flexibility exercises available.")
     
@@ -688,30 +694,32 @@ def display_exercise_recommendations(user_data):
     category_tabs = st.tabs(["Strength Training", "Cardio", "Flexibility & Mobility"])
     
     with category_tabs[0]:  # Strength
-        if 'Strength' in exercise_recommendations and exercise_recommendations['Strength']:
-            for i, exercise in enumerate(exercise_recommendations['Strength']):
-                with st.expander(f"{i+1}. {exercise['name']} - {exercise['main_muscle']}"):
-                    display_exercise_content(exercise, context_id=f"strength_{i}", user_data=user_data)
+        if not strength_df.empty:
+            display_exercise_expanders(strength_df, "strength", user_data)
         else:
             st.info("No strength exercises available.")
     
     with category_tabs[1]:  # Cardio
-        if 'Cardio' in exercise_recommendations and exercise_recommendations['Cardio']:
-            for i, exercise in enumerate(exercise_recommendations['Cardio']):
-                with st.expander(f"{i+1}. {exercise['name']} - {exercise['main_muscle']}"):
-                    display_exercise_content(exercise, context_id=f"cardio_{i}", user_data=user_data)
+        if not cardio_df.empty:
+            display_exercise_expanders(cardio_df, "cardio", user_data)
         else:
             st.info("No cardio exercises available.")
     
     with category_tabs[2]:  # Flexibility
-        if 'Flexibility' in exercise_recommendations and exercise_recommendations['Flexibility']:
-            for i, exercise in enumerate(exercise_recommendations['Flexibility']):
-                with st.expander(f"{i+1}. {exercise['name']} - {exercise['main_muscle']}"):
-                    display_exercise_content(exercise, context_id=f"flexibility_{i}", user_data=user_data)
+        if not flexibility_df.empty:
+            display_exercise_expanders(flexibility_df, "flexibility", user_data)
         else:
             st.info("No flexibility exercises available.")
 
-def display_exercise_variations(exercise):
+def display_exercise_expanders(exercises_df, context_prefix, user_data=None, start=0):
+    """
+    Display each exercise in a DataFrame as a numbered expander with its details
+    """
+    for i, exercise in enumerate(exercises_df.to_dict('records')):
+        with st.expander(f"{i+1 + start}. {exercise['name']} - {exercise['main_muscle']}"):
+            display_exercise_content(exercise, context_id=f"{context_prefix}_{i}", user_data=user_data)
+
+def display_exercise_variations(exercise_type):
     """Display exercise variations based on type and equipment"""
     st.markdown("**Exercise Variations:**")
     
@@ -744,29 +752,7 @@ def display_exercise_variations(exercise):
     
     # Equipment variations
     st.markdown("\n**Equipment Variations:**")
-    exercise_type = exercise.get('type', exercise.get('Type', ''))
-    if 'Strength' in exercise_type:
-        st.markdown("""
-        - Bodyweight version
-        - Dumbbell variation
-        - Resistance band option
-        - Barbell variation (if applicable)
-        - Cable machine alternative
-        """)
-    elif 'Cardio' in exercise_type:
-        st.markdown("""
-        - No equipment version
-        - With resistance bands
-        - Using cardio machines
-        - With weights for added challenge
-        """)
-    else:  # Flexibility
-        st.markdown("""
-        - Without equipment
-        - Using resistance bands
-        - With foam roller
-        - Using yoga props
-        """)
+    st.markdown(EQUIPMENT_VARIATIONS[classify_exercise_type(exercise_type)])
 
 if __name__ == "__main__":
     main()
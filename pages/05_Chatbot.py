@@ -1,4 +1,6 @@
 import os
+import random
+import httpx
 from openai import OpenAI
 import streamlit as st
 import pandas as pd
@@ -21,17 +23,43 @@ hide_streamlit_style = """
             """
 st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 
-# Load API key
-client = OpenAI(api_key=st.secrets["OPENAI_KEY"])
-
-# Load data
-food_data = pd.read_csv("attached_assets/cleaned_food_data_refined.csv")
-exercise_data = pd.read_csv("attached_assets/cleaned_exercise_data_refined.csv")
+@st.cache_resource
+def get_openai_client():
+    """Create the OpenAI client once and share it across reruns and sessions"""
+    return OpenAI(
+        api_key=st.secrets["OPENAI_KEY"],
+        http_client=httpx.Client(limits=httpx.Limits(max_keepalive_connections=20))
+    )
+
+@st.cache_data(show_spinner=False)
+def load_chat_food_data():
+    """Load the food dataset used for chat context"""
+    return pd.read_csv(
+        "attached_assets/cleaned_food_data_refined.csv",
+        usecols=["Food Name", "Calories", "Protein", "Carbs", "Total Fat"],
+        dtype={"Food Name": "string"}
+    )
+
+@st.cache_data(show_spinner=False)
+def load_chat_exercise_data():
+    """Load the exercise dataset used for chat context"""
+    return pd.read_csv(
+        "attached_assets/cleaned_exercise_data_refined.csv",
+        usecols=["Exercise", "Equipment Type", "Preparation", "Execution"],
+        dtype="string"
+    )
+
+# Number of recent messages rendered in full and sent to the model
+CHAT_HISTORY_WINDOW = 30
 
 def main():
     st.title("💬 Chat with Sma Bot")
     sidebar(current_page="💬 Chatbot Assistant")
 
+    # Load data
+    food_data = load_chat_food_data()
+    exercise_data = load_chat_exercise_data()
+
     # Get user data
     user_id = st.session_state.current_user
     user_data = get_user(user_id)
@@ -42,33 +70,63 @@ def main():
             {"role": "assistant", "content": f"Hi {user_data.get('name', 'there')}, how can I help you today?"}
         ]
 
-    # Display chat history
-    for msg in st.session_state.chat_history:
+    # Display chat history, keeping older turns folded away
+    earlier_messages = st.session_state.chat_history[:-CHAT_HISTORY_WINDOW]
+    if earlier_messages:
+        with st.expander("Earlier conversation"):
+            for msg in earlier_messages:
+                st.markdown(f"**{'You' if msg['role'] == 'user' else 'Sma Bot'}:** {msg['content']}")
+
+    for msg in st.session_state.chat_history[-CHAT_HISTORY_WINDOW:]:
         st.chat_message("user" if msg["role"] == "user" else "assistant").markdown(msg["content"])
 
+    # Build the system prompt once per session so every turn shares the same prefix
+    if "chat_system_prompt" not in st.session_state:
+        st.session_state.chat_system_prompt = build_chat_context(user_data, food_data, exercise_data)
+
     # Check input
     user_input = st.chat_input("Ask me something like 'give me a meal plan' or 'show a workout'")
+    if "pending_inputs" not in st.session_state:
+        st.session_state.pending_inputs = []
     if user_input:
-        st.session_state.chat_history.append({"role": "user", "content": user_input})
+        st.session_state.pending_inputs.append(user_input)
 
-        # Get AI response
-        response = get_chatbot_response(user_input, user_data, food_data, exercise_data)
-        st.session_state.chat_history.append({"role": "assistant", "content": response})
-        st.chat_message("assistant").markdown(response)
+    if st.session_state.pending_inputs:
+        for text in st.session_state.pending_inputs:
+            st.chat_message("user").markdown(text)
 
+        # Inputs stay pending until answered, so a message sent while a reply is still streaming
+        # interrupts that run and both go out together on the next one
+        user_input = "\n\n---\n\n".join(st.session_state.pending_inputs)
 
-# Response function to get chatbot response
-def get_chatbot_response(user_input, user_data, food_data, exercise_data):
-    try:
-        # Add sample meal and exercise to the context
-        sample_meal = food_data.sample(1).iloc[0]
-        sample_ex = exercise_data.sample(1).iloc[0]
+        # Only re-sample the meal and exercise when the user asks for a new one
+        if "another example" in user_input.lower():
+            st.session_state.chat_system_prompt = build_chat_context(user_data, food_data, exercise_data)
+
+        user_turn = {"role": "user", "content": user_input}
 
+        # Stream the AI response as it is generated
+        with st.chat_message("assistant"):
+            response = st.write_stream(get_chatbot_response(st.session_state.chat_system_prompt, st.session_state.chat_history[-(CHAT_HISTORY_WINDOW - 1):] + [user_turn]))
+
+        # Record the turn only once its reply is complete
+        st.session_state.chat_history += [user_turn, {"role": "assistant", "content": response}]
+        st.session_state.pending_inputs = []
+
+
+# Build the system prompt with the user's profile and a sample meal and exercise
+def build_chat_context(user_data, food_data, exercise_data):
+    meal_info = ""
+    if not food_data.empty:
+        sample_meal = food_data.iloc[random.randrange(len(food_data))]
         meal_info = f"""
         Here's a sample meal:
         - {sample_meal['Food Name']}: {sample_meal['Calories']} kcal, {sample_meal['Protein']}g protein, {sample_meal['Carbs']}g carbs, {sample_meal['Total Fat']}g fat
         """
 
+    exercise_info = ""
+    if not exercise_data.empty:
+        sample_ex = exercise_data.iloc[random.randrange(len(exercise_data))]
         exercise_info = f"""
         Here's a sample exercise:
         - {sample_ex['Exercise']}: Equipment - {sample_ex['Equipment Type']}
@@ -76,7 +134,7 @@ def get_chatbot_response(user_input, user_data, food_data, exercise_data):
         Execution: {sample_ex['Execution']}
         """
 
-        context = f"""
+    return f"""
         The user is a {user_data.get('age', 'N/A')}-year-old {user_data.get('gender', 'N/A')} 
         with the goal of {user_data.get('goal', 'N/A')}, following a {user_data.get('diet', 'N/A')} diet.
         Their current weight is {user_data.get('weight', 'N/A')}kg, height {user_data.get('height', 'N/A')}cm, and BMI is {user_data.get('bmi', 'N/A')}.
@@ -85,19 +143,23 @@ def get_chatbot_response(user_input, user_data, food_data, exercise_data):
         {exercise_info}
         """
 
-        messages = [
-            {"role": "system", "content": context},
-            {"role": "user", "content": user_input},
-        ]
 
-        response = client.chat.completions.create(
+# Response function to get chatbot response, yielding the reply in chunks as they arrive
+def get_chatbot_response(system_prompt, chat_history):
+    try:
+        messages = [{"role": "system", "content": system_prompt}] + chat_history
+
+        stream = get_openai_client().chat.completions.create(
             model="gpt-3.5-turbo",
-            messages=messages
+            messages=messages,
+            stream=True
         )
-        return response.choices[0].message.content
+        for chunk in stream:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
     
     except Exception as e:
-        return f"⚠️ An error occurred: {e}"
+        yield f"⚠️ An error occurred: {e}"
     
 if __name__ == "__main__":
     main()
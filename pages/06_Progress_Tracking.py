@@ -1,13 +1,9 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from bson.objectid import ObjectId
 from datetime import datetime, timedelta
 from utils.db import journal_collection
-from utils.user_management import get_user, update_user_progress
-from utils.visualization import create_weight_progress_chart, create_bmi_chart
+from utils.user_management import get_user, update_user_progress, summarize_progress, parse_progress_timestamp
 from utils.sidebar import sidebar
 from utils.data_processing import load_journal_entry
 
@@ -26,6 +22,100 @@ hide_streamlit_style = """
             """
 st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 
+@st.cache_data(max_entries=16)
+def get_progress_df(user_id, history_length, last_timestamp, _progress_history):
+    """
+    Build the progress history DataFrame sorted by date.
+    Cached on the user, history length and latest timestamp, so the history list itself is not hashed.
+    """
+    df = pd.DataFrame(_progress_history)
+    if df.empty:
+        return df
+    # Sessions from before the login backfill can still hold legacy string timestamps, possibly mixed with datetimes
+    df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+    return df.sort_values('timestamp')
+
+def progress_history_key(user_data):
+    """
+    Cheap hashable key identifying the current state of a user's progress history
+    """
+    history = user_data.get('progress_history') or []
+    if not history:
+        return (user_data.get('_id'), 0, None, None)
+    return (user_data.get('_id'), len(history), history[-1].get('timestamp'), history[-1].get('weight'))
+
+@st.cache_data(max_entries=16)
+def cached_weight_fig(history_key, _progress_history):
+    from utils.visualization import create_weight_progress_chart
+    return create_weight_progress_chart(_progress_history)
+
+@st.cache_data(max_entries=16)
+def cached_bmi_fig(bmi, status):
+    from utils.visualization import create_bmi_chart
+    return create_bmi_chart(bmi, status)
+
+@st.cache_data(max_entries=16)
+def cached_trend_fig(history_key, _history_df, _progress_history):
+    # Plotly is only needed once a chart is actually built
+    import plotly.express as px
+    import plotly.graph_objects as go
+    
+    trend_layout = dict(
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        height=400
+    )
+    
+    # Typical histories are short; build the traces directly instead of going through px
+    if len(_progress_history) < 30:
+        ts = [parse_progress_timestamp(entry['timestamp']) for entry in _progress_history]
+        weights = np.fromiter((entry['weight'] for entry in _progress_history), dtype=np.float64)
+        
+        trend_fig = go.Figure([
+            go.Scatter(x=ts, y=weights, mode='lines', name='weight', line=dict(color='blue')),
+            go.Scatter(x=ts, y=moving_avg7(weights), mode='lines', name='weight_ma', line=dict(color='red'))
+        ])
+        trend_fig.update_layout(
+            title='Weight Trend with 7-Day Moving Average',
+            xaxis_title='Date',
+            yaxis_title='Weight (kg)',
+            legend_title_text='Metric',
+            **trend_layout
+        )
+        return trend_fig
+    
+    # Create a 7-day moving average to show trend
+    df = _history_df.assign(
+        weight_ma=moving_avg7(_history_df['weight'].to_numpy(dtype=np.float64))
+    )
+    
+    # Create the trend chart
+    trend_fig = px.line(
+        df, 
+        x='timestamp', 
+        y=['weight', 'weight_ma'],
+        labels={'timestamp': 'Date', 'value': 'Weight (kg)', 'variable': 'Metric'},
+        title='Weight Trend with 7-Day Moving Average',
+        color_discrete_map={'weight': 'blue', 'weight_ma': 'red'}
+    )
+    
+    trend_fig.update_layout(**trend_layout)
+    return trend_fig
+
+# Only the user fields this page reads
+PROGRESS_USER_FIELDS = {
+    "username": 1, "weight": 1, "bmi": 1, "health_status": 1, "goal": 1, "progress_history": 1, "summary": 1
+}
+
+@st.cache_data(ttl=30, max_entries=64)
+def get_progress_user(user_id):
+    return get_user(user_id, PROGRESS_USER_FIELDS)
+
 def main():
     st.title("📈 Progress Tracking")
     sidebar(current_page="📈 Progress Tracking")
@@ -34,12 +124,12 @@ def main():
     if not st.session_state.current_user:
         st.warning("Please create or select a profile to track your progress.")
         st.info("Go to the Profile page to create or select a profile.")
-        
+        return
     
     
     # Get user data
     user_id = st.session_state["current_user"]
-    user_data = get_user(user_id)
+    user_data = get_progress_user(user_id)
 
     
     if not user_data:
@@ -49,11 +139,26 @@ def main():
     # Display user info
     st.subheader(f"🌞 Greetings, {user_data.get('username', 'User').title()}")
     
+    # Parse the progress history once for all the sections below
+    progress_history = user_data.get('progress_history') or []
+    history_df = get_progress_df(
+        user_id,
+        len(progress_history),
+        progress_history[-1].get('timestamp') if progress_history else None,
+        progress_history
+    )
+    
+    # Summary is maintained on write; older profiles without one get it computed here
+    summary = user_data.get('summary') or summarize_progress(progress_history)
+    
+    # Build the weight chart once; it is shown in the charts and, for muscle gain, the goal section
+    weight_fig = cached_weight_fig(progress_history_key(user_data), progress_history) if progress_history else None
+    
     # Overview metrics
     display_overview_metrics(user_data)
     
     # Progress charts
-    display_progress_charts(user_data)
+    display_progress_charts(user_data, history_df, weight_fig, summary)
     
     # Quick update form
     st.subheader("Quick Update")
@@ -74,9 +179,9 @@ def main():
             last_update = "No previous updates"
             if user_data.get('progress_history') and len(user_data['progress_history']) > 0:
                 last_entry = user_data['progress_history'][-1]
-                if 'timestamp' in last_entry:
-                    last_update_time = datetime.strptime(last_entry['timestamp'], "%Y-%m-%d %H:%M:%S")
-                    days_since = (datetime.now() - last_update_time).days
+                last_time = parse_progress_timestamp(last_entry.get('timestamp'))
+                if last_time:
+                    days_since = (datetime.now() - last_time).days
                     last_update = f"{days_since} days ago" if days_since > 0 else "Today"
             
             st.markdown(f"**Last Update:** {last_update}")
@@ -88,6 +193,7 @@ def main():
         if update_button:
             success, message = update_user_progress(user_id, current_weight)
             if success:
+                get_progress_user.clear()
                 st.success(message)
                 # Refresh the page to show updated data
                 st.rerun()
@@ -95,7 +201,7 @@ def main():
                 st.error(message)
     
     # Goal tracking
-    display_goal_tracking(user_data)
+    display_goal_tracking(user_data, summary, weight_fig)
     
     # Progress journal
     st.subheader("Progress Journal")
@@ -116,7 +222,13 @@ def main():
     # Display recent journal entries
     st.subheader("Journal History")
 
-    journal_entries = journal_collection.find({"user_id": user_id}).sort("_id", -1)
+    # Only fetch the current page of entries (and only the fields we render)
+    journal_page = st.session_state.get('journal_page', 20)
+    journal_entries = list(
+        journal_collection.find({"user_id": user_id}, {"timestamp": 1, "entry": 1})
+        .sort("_id", -1)
+        .limit(journal_page)
+    )
 
     for entry in journal_entries:
         st.markdown(f"""
@@ -125,9 +237,14 @@ def main():
         {entry['entry']}
         """)
 
+    if len(journal_entries) == journal_page:
+        if st.button("Load more"):
+            st.session_state.journal_page = journal_page + 20
+            st.rerun()
+
     
     # Full progress history
-    display_full_history(user_data)
+    display_full_history(user_data, history_df)
 
 def display_overview_metrics(user_data):
     """
@@ -170,7 +287,7 @@ def get_bmi_delta(user_data):
     
     return None
 
-def display_progress_charts(user_data):
+def display_progress_charts(user_data, history_df, weight_fig, summary):
     """
     Display progress charts for the user
     """
@@ -182,14 +299,11 @@ def display_progress_charts(user_data):
     with chart_tabs[0]:
         progress_history = user_data.get('progress_history', [])
         if progress_history:
-            weight_fig = create_weight_progress_chart(progress_history)
             st.plotly_chart(weight_fig, use_container_width=True, key="weight_chart_progress_tab")
             
             # Add insight about weight change
-            if len(progress_history) > 1:
-                first_weight = progress_history[0].get('weight', 0)
-                current_weight = progress_history[-1].get('weight', 0)
-                total_change = current_weight - first_weight
+            if summary['entries'] > 1:
+                total_change = summary['current_weight'] - summary['starting_weight']
                 
                 if abs(total_change) > 0.1:  # Only show if there's a meaningful change
                     change_text = "lost" if total_change < 0 else "gained"
@@ -201,7 +315,7 @@ def display_progress_charts(user_data):
         bmi = user_data.get('bmi', 0)
         status = user_data.get('health_status', 'Unknown')
         
-        bmi_fig = create_bmi_chart(bmi, status)
+        bmi_fig = cached_bmi_fig(bmi, status)
         st.plotly_chart(bmi_fig, use_container_width=True)
         
         # Add BMI category information
@@ -218,40 +332,12 @@ def display_progress_charts(user_data):
     with chart_tabs[2]:
         progress_history = user_data.get('progress_history', [])
         if progress_history and len(progress_history) > 2:
-            # Create a weekly average chart to show trend
-            df = pd.DataFrame(progress_history)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df = df.sort_values('timestamp')
-            
-            # Create a 7-day moving average
-            df['weight_ma'] = df['weight'].rolling(window=min(7, len(df)), min_periods=1).mean()
-            
-            # Create the trend chart
-            trend_fig = px.line(
-                df, 
-                x='timestamp', 
-                y=['weight', 'weight_ma'],
-                labels={'timestamp': 'Date', 'value': 'Weight (kg)', 'variable': 'Metric'},
-                title='Weight Trend with 7-Day Moving Average',
-                color_discrete_map={'weight': 'blue', 'weight_ma': 'red'}
-            )
-            
-            trend_fig.update_layout(
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
-                ),
-                height=400
-            )
-            
+            trend_fig = cached_trend_fig(progress_history_key(user_data), history_df, progress_history)
             st.plotly_chart(trend_fig, use_container_width=True)
             
             # Calculate rate of change per week
-            if len(df) > 7:
-                weekly_change = calculate_weekly_change(df)
+            if len(history_df) > 7:
+                weekly_change = summary['weekly_change']
                 
                 if weekly_change is not None:
                     if weekly_change < 0:
@@ -267,30 +353,13 @@ def display_progress_charts(user_data):
         else:
             st.info("Need more data points to analyze trends. Continue updating your progress regularly.")
 
-def calculate_weekly_change(df):
+def moving_avg7(x):
     """
-    Calculate average weekly weight change
+    Trailing 7-point moving average (shorter window for the first entries)
     """
-    try:
-        # Get first and last entries
-        first_entry = df.iloc[0]
-        last_entry = df.iloc[-1]
-        
-        # Calculate total days
-        days_diff = (last_entry['timestamp'] - first_entry['timestamp']).days
-        
-        if days_diff < 1:
-            return None
-        
-        # Calculate weight change
-        weight_diff = last_entry['weight'] - first_entry['weight']
-        
-        # Calculate weekly change
-        weekly_change = weight_diff * 7 / days_diff
-        
-        return weekly_change
-    except:
-        return None
+    csum = np.cumsum(x)
+    csum[7:] = csum[7:] - csum[:-7]
+    return csum / np.minimum(np.arange(1, x.size + 1), 7)
 
 def provide_trend_recommendation(goal, weekly_change):
     """
@@ -326,7 +395,7 @@ def provide_trend_recommendation(goal, weekly_change):
         else:
             st.info("Your weight is changing slightly. If maintenance is your goal, small adjustments to diet or activity may help.")
 
-def display_goal_tracking(user_data):
+def display_goal_tracking(user_data, summary, weight_fig):
     """
     Display goal tracking section
     """
@@ -338,19 +407,19 @@ def display_goal_tracking(user_data):
     st.markdown(f"**Current Goal:** {goal}")
     
     if 'weight loss' in goal.lower():
-        display_weight_loss_goal(progress_history)
+        display_weight_loss_goal(summary)
     elif 'weight gain' in goal.lower():
-        display_weight_gain_goal(progress_history)
+        display_weight_gain_goal(summary)
     elif 'muscle gain' in goal.lower():
-        display_muscle_gain_goal(progress_history)
+        display_muscle_gain_goal(progress_history, weight_fig)
     else:
         st.info("Set a specific weight or fitness goal in your profile to track progress toward that goal.")
 
-def display_weight_loss_goal(progress_history):
+def display_weight_loss_goal(summary):
     """
     Display weight loss goal tracking
     """
-    if not progress_history or len(progress_history) < 2:
+    if not summary or summary['entries'] < 2:
         st.info("Need more data to track weight loss progress. Update your weight regularly.")
         return
     
@@ -359,21 +428,25 @@ def display_weight_loss_goal(progress_history):
     
     with col1:
         # Get starting weight
-        starting_weight = progress_history[0].get('weight', 0)
-        current_weight = progress_history[-1].get('weight', 0)
+        starting_weight = summary['starting_weight']
+        current_weight = summary['current_weight']
         
         weight_lost = starting_weight - current_weight
         
         if 'target_weight' not in st.session_state:
             st.session_state.target_weight = current_weight - 5  # Default 5kg below current
         
-        target_weight = st.number_input(
-            "Target Weight (kg)",
-            min_value=25.0,
-            max_value=starting_weight - 0.1,
-            value=st.session_state.target_weight
-        )
-        st.session_state.target_weight = target_weight
+        # Only commit the target on submit so typing doesn't rerun the page
+        with st.form("wl_goal", clear_on_submit=False):
+            target_input = st.number_input(
+                "Target Weight (kg)",
+                min_value=25.0,
+                max_value=starting_weight - 0.1,
+                value=st.session_state.target_weight
+            )
+            if st.form_submit_button("Update target"):
+                st.session_state.target_weight = target_input
+        target_weight = st.session_state.target_weight
     
     with col2:
         # Calculate progress percentage
@@ -388,14 +461,9 @@ def display_weight_loss_goal(progress_history):
         st.markdown(f"**{progress_pct:.1f}% of goal achieved**")
     
     # Calculate estimated completion
-    if len(progress_history) > 2 and weight_lost > 0:
-        # Create a dataframe of progress history
-        df = pd.DataFrame(progress_history)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.sort_values('timestamp')
-        
+    if summary['entries'] > 2 and weight_lost > 0:
         # Calculate weekly rate of loss
-        weekly_change = calculate_weekly_change(df)
+        weekly_change = summary['weekly_change']
         
         if weekly_change and weekly_change < 0:
             # Calculate remaining weight to lose
@@ -411,11 +479,11 @@ def display_weight_loss_goal(progress_history):
         else:
             st.warning("Your weight isn't currently decreasing. Adjust your calorie intake or activity level to create a deficit.")
 
-def display_weight_gain_goal(progress_history):
+def display_weight_gain_goal(summary):
     """
     Display weight gain goal tracking
     """
-    if not progress_history or len(progress_history) < 2:
+    if not summary or summary['entries'] < 2:
         st.info("Need more data to track weight gain progress. Update your weight regularly.")
         return
     
@@ -424,21 +492,25 @@ def display_weight_gain_goal(progress_history):
     
     with col1:
         # Get starting weight
-        starting_weight = progress_history[0].get('weight', 0)
-        current_weight = progress_history[-1].get('weight', 0)
+        starting_weight = summary['starting_weight']
+        current_weight = summary['current_weight']
         
         weight_gained = current_weight - starting_weight
         
         if 'target_weight_gain' not in st.session_state:
             st.session_state.target_weight_gain = current_weight + 5  # Default 5kg above current
         
-        target_weight = st.number_input(
-            "Target Weight (kg)",
-            min_value=starting_weight + 0.1,
-            max_value=250.0,
-            value=st.session_state.target_weight_gain
-        )
-        st.session_state.target_weight_gain = target_weight
+        # Only commit the target on submit so typing doesn't rerun the page
+        with st.form("wg_goal", clear_on_submit=False):
+            target_input = st.number_input(
+                "Target Weight (kg)",
+                min_value=starting_weight + 0.1,
+                max_value=250.0,
+                value=st.session_state.target_weight_gain
+            )
+            if st.form_submit_button("Update target"):
+                st.session_state.target_weight_gain = target_input
+        target_weight = st.session_state.target_weight_gain
     
     with col2:
         # Calculate progress percentage
@@ -453,14 +525,9 @@ def display_weight_gain_goal(progress_history):
         st.markdown(f"**{progress_pct:.1f}% of goal achieved**")
     
     # Calculate estimated completion
-    if len(progress_history) > 2 and weight_gained > 0:
-        # Create a dataframe of progress history
-        df = pd.DataFrame(progress_history)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.sort_values('timestamp')
-        
+    if summary['entries'] > 2 and weight_gained > 0:
         # Calculate weekly rate of gain
-        weekly_change = calculate_weekly_change(df)
+        weekly_change = summary['weekly_change']
         
         if weekly_change and weekly_change > 0:
             # Calculate remaining weight to gain
@@ -476,7 +543,7 @@ def display_weight_gain_goal(progress_history):
         else:
             st.warning("Your weight isn't currently increasing. Consider increasing your calorie intake to create a surplus.")
 
-def display_muscle_gain_goal(progress_history):
+def display_muscle_gain_goal(progress_history, weight_fig):
     """
     Display muscle gain goal information
     """
@@ -499,10 +566,13 @@ def display_muscle_gain_goal(progress_history):
     
     # Show weight chart as supplementary data
     if progress_history:
-        weight_fig = create_weight_progress_chart(progress_history)
         st.plotly_chart(weight_fig, use_container_width=True, key="weight_chart_muscle_goal")
 
-def display_full_history(user_data):
+@st.cache_data(max_entries=16)
+def get_history_csv(history_key, _df):
+    return _df.to_csv(index=False, date_format='%Y-%m-%d %H:%M:%S').encode()
+
+def display_full_history(user_data, history_df):
     """
     Display full progress history
     """
@@ -514,25 +584,25 @@ def display_full_history(user_data):
         st.info("No progress history available yet.")
         return
     
-    # Convert to DataFrame for display
-    df = pd.DataFrame(progress_history)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df = df.sort_values('timestamp', ascending=False)
+    # Newest entries first for display
+    df = history_df.sort_values('timestamp', ascending=False)
     
-    # Format for display
-    display_df = df.copy()
-    display_df['timestamp'] = display_df['timestamp'].dt.strftime('%Y-%m-%d %H:%M')
-    display_df = display_df.rename(columns={
+    # Rename for display; timestamps stay native and are formatted by the table itself
+    display_df = df.rename(columns={
         'timestamp': 'Date',
         'weight': 'Weight (kg)',
         'bmi': 'BMI'
     })
     
     # Show in a data table
-    st.dataframe(display_df, use_container_width=True)
+    st.dataframe(
+        display_df,
+        use_container_width=True,
+        column_config={"Date": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm")}
+    )
     
     # Option to download history
-    csv = df.to_csv(index=False)
+    csv = get_history_csv(progress_history_key(user_data), df)
     st.download_button(
         label="Download Progress History",
         data=csv,
@@ -1,30 +1,74 @@
 import streamlit as st
 import pandas as pd
 import os
-from bson.objectid import ObjectId
+import pyarrow.parquet as pq
+from datetime import datetime, timedelta
 from utils.sidebar import sidebar
-from utils.data_processing import log_event, load_system_logs
+from utils.data_processing import log_event, load_system_logs, load_log_summary
+from pymongo import UpdateOne
 from utils.db import users_collection
+from utils.visualization import display_dataframe_quickly
+
+USER_PAGE_SIZE = 25
 
 # ================= Helper Functions =================
 
-def load_user_records(path):
-    """Load user records from JSON"""
+def file_mtime(path):
+    """Modification time of a file, used to invalidate cached loads when it changes"""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+def records_parquet(path_json):
+    """Transcode the records JSON to a Parquet sidecar if it is missing or stale, returning its path"""
+    parquet_path = os.path.splitext(path_json)[0] + ".parquet"
+    if not os.path.exists(parquet_path) or os.path.getmtime(parquet_path) < os.path.getmtime(path_json):
+        pd.read_json(path_json).to_parquet(parquet_path, compression='snappy')
+    return parquet_path
+
+@st.cache_data(show_spinner=False)
+def load_user_records(path, mtime):
+    """Load user records, via the Parquet sidecar of the JSON file"""
+    try:
+        return pd.read_parquet(records_parquet(path))
+    except Exception as e:
+        print(f"Parquet sidecar unavailable, reading JSON directly: {e}")
+
     try:
         return pd.read_json(path)
     except Exception as e:
         st.error(f"Error loading user records: {e}")
         return None
 
-def load_meal_plans(path):
-    """Load meal plans from Parquet"""
+MEAL_OVERVIEW_COLUMNS = ('name', 'calories', 'protein', 'carbs', 'fat')
+
+@st.cache_data(show_spinner=False)
+def load_meal_plans(path, mtime, columns=MEAL_OVERVIEW_COLUMNS):
+    """Load meal plans from Parquet (only the requested columns are read)"""
     try:
-        return pd.read_parquet(path)
+        # Keep Arrow-backed columns so st.dataframe can serialize them without object conversion
+        table = pq.read_table(path, columns=list(columns))
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
     except Exception as e:
         st.error(f"Error loading meal plans: {e}")
         return None
 
-def load_exercise_data(path):
+@st.cache_resource(show_spinner=False)
+def get_parquet_file(path, mtime):
+    """Open a Parquet file once per file version so its footer metadata is parsed only once"""
+    return pq.ParquetFile(path)
+
+def count_parquet_rows(path, mtime):
+    """Row count from the Parquet footer, without reading any row data"""
+    try:
+        return get_parquet_file(path, mtime).metadata.num_rows
+    except Exception as e:
+        st.error(f"Error reading meal plan metadata: {e}")
+        return None
+
+@st.cache_data(show_spinner=False)
+def load_exercise_data(path, mtime):
     """Load exercise recommendations from CSV"""
     try:
         return pd.read_csv(path)
@@ -36,19 +80,21 @@ def show_user_overview(records_df):
     """Display user overview section"""
     st.subheader("👥 Registered Users Summary")
 
+    # Live count from the database rather than the (possibly stale) records file
+    st.metric("Total Users", count_users())
+
     if records_df is not None:
-        st.metric("Total Users", len(records_df))
-        st.dataframe(records_df, use_container_width=True)
+        display_dataframe_quickly(records_df, max_rows=2000, use_container_width=True)
     else:
         st.warning("No user data available.")
 
-def show_meal_plan_overview(meal_df):
+def show_meal_plan_overview(meal_df, total_meals):
     """Display meal plan overview"""
     st.subheader("🍽️ Optimized Meals Overview")
 
     if meal_df is not None:
-        st.metric("Total Meals Available", len(meal_df))
-        st.dataframe(meal_df[['name', 'calories', 'protein', 'carbs', 'fat']], use_container_width=True)
+        st.metric("Total Meals Available", total_meals)
+        display_dataframe_quickly(meal_df, max_rows=2000, use_container_width=True)
     else:
         st.warning("No meal plan data available.")
 
@@ -58,62 +104,153 @@ def show_exercise_plan_overview(exercise_df):
 
     if exercise_df is not None:
         st.metric("Exercises Available", len(exercise_df))
-        st.dataframe(exercise_df, use_container_width=True)
+        display_dataframe_quickly(exercise_df, max_rows=2000, use_container_width=True)
     else:
         st.warning("No exercise data available.")
 
+@st.cache_data(show_spinner=False)
+def list_assets(path, dir_mtime):
+    """Sorted directory listing, cached until the directory changes"""
+    return sorted(os.listdir(path))
+
 def show_assets_listing(path):
     """List available assets"""
     st.subheader("🗂️ Available Data Assets")
 
     try:
-        files = os.listdir(path)
+        files = list_assets(path, os.path.getmtime(path))
         if files:
-            for file in files:
-                st.write(f"📄 {file}")
+            st.markdown("\n".join(f"- 📄 {file}" for file in files))
         else:
             st.info("No assets found.")
     except Exception as e:
         st.error(f"Failed to list attached assets: {e}")
 
+@st.cache_data(ttl=30)
+def count_users():
+    """Approximate user count from collection metadata (no collection scan)"""
+    return users_collection.estimated_document_count()
+
+# Button callbacks: Streamlit reruns once after these, so no explicit st.rerun() is needed
+
+def clear_pending_action(pending_key):
+    st.session_state.pop(pending_key, None)
+
+def confirm_promote(user_id, oid, username):
+    users_collection.update_one({"_id": oid}, {"$set": {"is_admin": True}})
+    log_event("action", f"User {username} promoted to Admin.", user_id)
+    st.toast(f"{username} has been promoted to Admin!")
+    clear_pending_action(f"pending_promote_{user_id}")
+
+def confirm_delete(user_id, oid, username):
+    users_collection.delete_one({"_id": oid})
+    log_event("action", f"User {username} deleted.", user_id)
+    st.toast(f"{username} deleted successfully.")
+    clear_pending_action(f"pending_delete_{user_id}")
+    count_users.clear()
+
+def promote_selected(oids, usernames, editor_key):
+    users_collection.bulk_write(
+        [UpdateOne({"_id": oid}, {"$set": {"is_admin": True}}) for oid in oids],
+        ordered=False
+    )
+    log_event("action", f"Users {', '.join(usernames)} promoted to Admin.")
+    st.toast(f"{len(oids)} users promoted to Admin!")
+    st.session_state.pop(editor_key, None)
+
 def user_management():
     st.subheader("User Management")
 
-    users = list(users_collection.find({}))
-
-    if not users:
+    # Range-based pagination: keep the last _id of each page visited instead of using skip()
+    if "user_page_cursors" not in st.session_state:
+        st.session_state.user_page_cursors = [None]
+    cursors = st.session_state.user_page_cursors
+
+    query = {"_id": {"$gt": cursors[-1]}} if cursors[-1] is not None else {}
+    users_cursor = (
+        users_collection.find(query, {"username": 1, "email": 1, "is_admin": 1})
+        .sort("_id", 1)
+        .limit(USER_PAGE_SIZE)
+        .batch_size(USER_PAGE_SIZE)
+    )
+
+    # Keep the original ObjectIds so the action handlers don't re-parse the string ids
+    oid_by_str = st.session_state.setdefault("oid_by_str", {})
+
+    # Single pass over the cursor, collecting the table rows and the users that can be managed
+    rows, row_ids, manageable, last_id = [], [], [], None
+    for user in users_cursor:
+        oid_by_str[str(user["_id"])] = user["_id"]
+        row_ids.append(str(user["_id"]))
+        rows.append({
+            "Username": user.get("username", "N/A"),
+            "Email": user.get("email", "N/A"),
+            "Admin": user.get("is_admin", False)
+        })
+        if not user.get("is_admin", False):
+            manageable.append(user)
+        last_id = user["_id"]
+
+    if not rows and len(cursors) == 1:
         st.info("No users found in the database.")
         return
-    
-    for user in users:
-        username = user.get("username", "N/A")
-        email = user.get("email", "N/A")
-        is_admin = user.get("is_admin", False)
-        user_id = str(user["_id"])
-
-        # Display user info
-        col1, col2, col3, col4 = st.columns([2, 3, 2, 3])
-
-        with col1:
-            st.write(username)
-        with col2:
-            st.write(email)
-        with col3:
-            if is_admin:
-                st.success("✅ Admin")
-            else:
-                st.error("❌ Not Admin")
-        with col4:
-            if not is_admin:
-                promote_col, delete_col = st.columns(2)
-
-                with promote_col:
-                    if st.button(f"Promote", key=f"promote_{user_id}"):
-                        st.session_state[f"pending_promote_{user_id}"] = True
-
-                with delete_col:
-                    if st.button(f"Delete", key=f"delete_{user_id}"):
-                        st.session_state[f"pending_delete_{user_id}"] = True
+
+    # "Next" is enabled on any full page, so the previous page may have ended on the last user
+    if not rows:
+        st.info("No more users.")
+        if st.button("⬅️ Previous"):
+            cursors.pop()
+            st.rerun()
+        return
+
+    total_users = count_users()
+    total_pages = max(1, -(-total_users // USER_PAGE_SIZE))
+    st.caption(f"Page {len(cursors)} of ~{total_pages} ({total_users} users)")
+
+    # Display all users of the page in a single table
+    users_df = pd.DataFrame(rows)
+    users_df.insert(0, "Select", False)
+    editor_key = f"users_editor_{len(cursors)}"
+    edited_df = st.data_editor(
+        users_df,
+        use_container_width=True,
+        hide_index=True,
+        disabled=["Username", "Email", "Admin"],
+        key=editor_key
+    )
+
+    # Promote all ticked non-admin users in a single bulk write
+    selected_rows = edited_df.index[edited_df["Select"] & ~edited_df["Admin"]]
+    if len(selected_rows):
+        st.button(
+            f"Promote Selected ({len(selected_rows)})",
+            on_click=promote_selected,
+            args=(
+                [oid_by_str[row_ids[i]] for i in selected_rows],
+                [edited_df.at[i, "Username"] for i in selected_rows],
+                editor_key
+            )
+        )
+
+    # Actions are shown only for the selected non-admin user
+    if manageable:
+        selected = st.selectbox(
+            "User to manage",
+            range(len(manageable)),
+            format_func=lambda i: manageable[i].get("username", "N/A")
+        )
+        username = manageable[selected].get("username", "N/A")
+        user_id = str(manageable[selected]["_id"])
+
+        promote_col, delete_col = st.columns(2)
+
+        with promote_col:
+            if st.button(f"Promote", key=f"promote_{user_id}"):
+                st.session_state[f"pending_promote_{user_id}"] = True
+
+        with delete_col:
+            if st.button(f"Delete", key=f"delete_{user_id}"):
+                st.session_state[f"pending_delete_{user_id}"] = True
 
         # handle pending actions outside buttons
         if st.session_state.get(f"pending_promote_{user_id}", False):
@@ -122,18 +259,12 @@ def user_management():
             confirm_col, cancel_col = st.columns(2)
 
             with confirm_col:
-                if st.button(f"✅ Confirm", key=f"confirm_promote_{user_id}"):
-                    users_collection.update_one({"_id": ObjectId(user_id)}, {"$set": {"is_admin": True}})
-                    log_event("action", f"User {username} promoted to Admin.", user_id)
-                    st.success(f"{username} has been promoted to Admin!")
-                    st.session_state.pop(f"pending_promote_{user_id}", None)
-                    del st.session_state[f"pending_promote_{user_id}"]
-                    st.rerun()
+                st.button(f"✅ Confirm", key=f"confirm_promote_{user_id}",
+                          on_click=confirm_promote, args=(user_id, oid_by_str[user_id], username))
 
             with cancel_col:
-                if st.button(f"❌ Cancel", key=f"cancel_promote_{user_id}"):
-                    del st.session_state[f"pending_promote_{user_id}"]
-                    st.rerun()
+                st.button(f"❌ Cancel", key=f"cancel_promote_{user_id}",
+                          on_click=clear_pending_action, args=(f"pending_promote_{user_id}",))
 
         if st.session_state.get(f"pending_delete_{user_id}", False):
             st.error(f"⚠️ Are you sure you want to delete {username}? This cannot be undone.")
@@ -141,20 +272,25 @@ def user_management():
             confirm_col, cancel_col = st.columns(2)
 
             with confirm_col:
-                if st.button(f"✅ Confirm", key=f"confirm_delete_{user_id}"):
-                    users_collection.delete_one({"_id": ObjectId(user_id)})
-                    log_event("action", f"User {username} deleted.", user_id)
-                    st.success(f"{username} deleted successfully.")
-                    del st.session_state[f"pending_delete_{user_id}"]
-                    st.rerun()
+                st.button(f"✅ Confirm", key=f"confirm_delete_{user_id}",
+                          on_click=confirm_delete, args=(user_id, oid_by_str[user_id], username))
 
             with cancel_col:
-                if st.button(f"❌ Cancel", key=f"cancel_delete_{user_id}"):
-                    del st.session_state[f"pending_delete_{user_id}"]
-                    st.rerun()
+                st.button(f"❌ Cancel", key=f"cancel_delete_{user_id}",
+                          on_click=clear_pending_action, args=(f"pending_delete_{user_id}",))
 
     st.divider()
 
+    prev_col, next_col = st.columns(2)
+    with prev_col:
+        if st.button("⬅️ Previous", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with next_col:
+        if st.button("Next ➡️", disabled=len(rows) < USER_PAGE_SIZE):
+            cursors.append(last_id)
+            st.rerun()
+
 def view_system_logs():
     st.subheader("System Logs")
     
@@ -163,23 +299,23 @@ def view_system_logs():
     search_keyword = st.text_input("Search logs...")
     limit = st.slider("Number of recent entries", key="system log slider", min_value=10, max_value=500, value=100)
 
-    # Load logs from DB
-    logs = load_system_logs()
-
-    # Filter logs
-    if log_type_filter != "All":
-        logs = [log for log in logs if log["type"] == log_type_filter.lower()]
-    if search_keyword:
-        logs = [log for log in logs if search_keyword.lower() in log["message"].lower()]
-
-    logs = logs[-limit:]  # Last N entries
-
-    # Display
-    for log in reversed(logs):
-        st.markdown(f"""
-        - **{log['timestamp']}**  
-        {log['type'].upper()} ➔ {log['message']}
-        """)
+    # Event counts for the last day are grouped in the database rather than from the listed logs
+    summary = load_log_summary(datetime.now() - timedelta(days=1))
+    if summary:
+        st.caption("Last 24 hours: " + ", ".join(f"{row['count']} {row['type']}" for row in summary))
+
+    # Load the filtered, most recent logs from DB
+    logs = load_system_logs(log_type_filter, search_keyword, limit)
+
+    # Display in cursor order (already newest first and limited by Mongo) as one block
+    entries = [
+        f"- **{log['timestamp']}**  \n  {log['type'].upper()} ➔ {log['message']}"
+        for log in logs
+    ]
+    if entries:
+        st.markdown("\n".join(entries))
+    else:
+        st.info("No logs found.")
 
 # ================ Main Admin Dashboard =================
 
@@ -196,6 +332,8 @@ hide_streamlit_style = """
             [data-testid="stSidebarNav"] {display: none;}
             </style>
             """
+# Re-emitted on every rerun on purpose: Streamlit drops elements a rerun doesn't write,
+# so guarding this per session would remove the style after the first interaction
 st.markdown(hide_streamlit_style, unsafe_allow_html=True)
 
 def main():
@@ -215,23 +353,19 @@ def main():
     meals_path = os.path.join(assets_dir, "optimized_meals.parquet")
     exercise_path = os.path.join(assets_dir, "cleaned_exercise_data_refined.csv")
 
-    # Load Data
-    records_df = load_user_records(records_path)
-    meals_df = load_meal_plans(meals_path)
-    exercise_df = load_exercise_data(exercise_path)
-
-    # Routing Pages
+    # Routing Pages (each section loads only the data it shows)
     if selected_page == "User Overview":
-        show_user_overview(records_df)
+        show_user_overview(load_user_records(records_path, file_mtime(records_path)))
 
     elif selected_page == "Manage Users":
         user_management()
 
     elif selected_page == "Meal Plans":
-        show_meal_plan_overview(meals_df)
+        meals_mtime = file_mtime(meals_path)
+        show_meal_plan_overview(load_meal_plans(meals_path, meals_mtime), count_parquet_rows(meals_path, meals_mtime))
 
     elif selected_page == "Exercise Plans":
-        show_exercise_plan_overview(exercise_df)
+        show_exercise_plan_overview(load_exercise_data(exercise_path, file_mtime(exercise_path)))
 
     elif selected_page == "Manage Assets":
         show_assets_listing(assets_dir)
@@ -1,11 +1,201 @@
 import re
 import random
+import string
+from functools import lru_cache
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+# Number of distinct messages whose detected intent is remembered
+INTENT_CACHE_SIZE = 4096
+
+# Known names are indexed by this many leading characters, so inflected words ("bananas") still find them
+NAME_PREFIX_LENGTH = 3
 
 class NutritionChatbot:
+    # Phrases asking about a specific food; the last group holds the food name
+    FOOD_QUERY_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+        r'what\'s in (.+)\??',
+        r'nutrients? in (.+)',
+        r'calories in (.+)',
+        r'how (healthy|nutritious) is (.+)\??',
+        r'tell me about (.+) nutrition',
+        r'macros? in (.+)'
+    ]]
+    
+    # Phrases asking for exercises for a muscle group
+    EXERCISE_QUERY_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+        r'exercises? for (my )?(.*?) (muscles?|strength|training)',
+        r'how to (train|work|exercise) (my )?(.*?)( muscles?)?',
+        r'(best|good|recommended|top) (.*?) exercises?',
+        r'(strengthen|tone|build) (my )?(.*?)( muscles?)?',
+        r'what (exercises?|workouts?) (should I do|are good|can I do) for (my )?(.*?)( muscles?)?'
+    ]]
+    
+    # Map muscle words to the muscle groups used in the exercise data
+    MUSCLE_ALIASES = {
+        'neck': 'neck', 
+        'shoulder': 'shoulder', 'shoulders': 'shoulder',
+        'upper arm': 'upper arms', 'bicep': 'upper arms', 'tricep': 'upper arms',
+        'biceps': 'upper arms', 'triceps': 'upper arms', 'arm': 'upper arms',
+        'arms': 'upper arms', 'upper body': 'upper arms',
+        'forearm': 'forearm', 'forearms': 'forearm', 'wrist': 'forearm',
+        'back': 'back', 'lats': 'back', 'traps': 'back',
+        'chest': 'chest', 'pecs': 'chest', 'pectorals': 'chest',
+        'hip': 'hips', 'hips': 'hips',
+        'thigh': 'thighs', 'thighs': 'thighs', 'quad': 'thighs',
+        'quads': 'thighs', 'quadriceps': 'thighs',
+        'hamstring': 'thighs', 'hamstrings': 'thighs',
+        'calf': 'calves', 'calves': 'calves', 'lower leg': 'calves',
+        'waist': 'waist', 'abs': 'waist', 'abdominals': 'waist',
+        'core': 'waist', 'stomach': 'waist', 'midsection': 'waist',
+        'glute': 'hips', 'glutes': 'hips', 'butt': 'hips', 'buttocks': 'hips'
+    }
+    # Longest aliases first, so 'forearm' is not read as 'arm'
+    MUSCLE_ALIAS_REGEX = re.compile('|'.join(
+        re.escape(alias) for alias in sorted(MUSCLE_ALIASES, key=len, reverse=True)
+    ))
+    
+    # Muscle groups looked for directly in a message
+    MUSCLE_GROUPS = (
+        'neck', 'shoulder', 'upper arms', 'forearm', 'back', 'chest', 
+        'hips', 'thighs', 'calves', 'waist', 'abs', 'core', 'glutes',
+        'quadriceps', 'hamstrings', 'biceps', 'triceps'
+    )
+    
+    # Equipment types recommended for each goal, compiled once
+    EXERCISE_FOCUS_PATTERNS = {
+        'weight loss': re.compile('Cardio|HIIT|Circuit', re.IGNORECASE),
+        'muscle gain': re.compile('Strength|Resistance|Weight', re.IGNORECASE),
+        'general': re.compile('Stretch|Cardio|Strength', re.IGNORECASE)
+    }
+    
+    # Canned replies picked at random by the simple responses
+    GREETINGS = (
+        "Hello! How can I help with your nutrition or fitness today? 😊",
+        "Hi there! I'm your nutrition and fitness assistant. What can I help you with? 🥗🏋️‍♂️",
+        "Welcome! Looking for meal ideas or exercise tips? I'm here to help! 🍎",
+        "Hey! Ready to chat about nutrition and fitness? What's on your mind? 💪",
+        "Greetings! I'm here to help with your health and wellness questions. What do you need? 🌱"
+    )
+    
+    GOODBYES = (
+        "Goodbye! Remember to stay hydrated and make healthy choices! 🚰",
+        "Take care! Come back anytime for more nutrition and fitness tips. 👋",
+        "See you later! Keep up the great work on your health journey! 🌟",
+        "Farewell! Remember, consistency is key to achieving your health goals. 🔑",
+        "Bye for now! Looking forward to helping you again soon! 😊"
+    )
+    
+    THANKS_REPLIES = (
+        "You're welcome! I'm happy to help with your nutrition and fitness needs. 😊",
+        "My pleasure! Feel free to ask if you have any other questions. 👍",
+        "Glad I could help! Remember, small changes add up to big results over time. 🌱",
+        "Anytime! Consistency is key to reaching your health and fitness goals. 🔑",
+        "No problem! Stay motivated and keep making healthy choices! 💪"
+    )
+    
+    NUTRITION_FACTS = (
+        "Protein contains 4 calories per gram and is essential for muscle repair and growth. 💪",
+        "Carbohydrates provide 4 calories per gram and are your body's primary energy source. 🍚",
+        "Fats contain 9 calories per gram and are important for hormone production and vitamin absorption. 🥑",
+        "Dietary fiber supports digestive health and can help manage hunger. Most adults should aim for 25-30g daily. 🌱",
+        "Staying hydrated is crucial - aim for around 3-4 liters of water daily, more if you're active or in hot weather. 💧",
+        "Micronutrients (vitamins and minerals) don't provide calories but are essential for health and metabolism. 🍎",
+        "Meal timing is less important than total daily nutrition, but spreading protein intake throughout the day can benefit muscle protein synthesis. ⏰",
+        "Whole foods typically provide better nutrition than processed alternatives, with more fiber and micronutrients. 🥦",
+        "A balanced plate includes protein, complex carbs, healthy fats, and plenty of colorful vegetables. 🍽️",
+        "The thermic effect of food means your body burns calories digesting what you eat - protein has the highest thermic effect. 🔥"
+    )
+    
+    GENERAL_REPLIES = (
+        "I'm not sure I understand. Could you rephrase that or ask about a specific food, exercise, or nutrition topic? 🤔",
+        "I'd love to help you with nutrition or fitness! Try asking about a specific food, exercise recommendations, or general health tips. 🍎",
+        "I can provide information about food nutrition, exercise recommendations, and healthy lifestyle tips. What specifically would you like to know about? 💪",
+        "Feel free to ask me about food nutrition, exercise suggestions, or general health advice. I'm here to help! 🥗",
+        "If you're looking for nutrition or fitness guidance, I can help! Try asking about specific foods, workout recommendations, or health goals. 🏋️‍♂️"
+    )
+    
+    # Diet descriptions by keyword, checked in order (the first keyword found in the message wins)
+    DIET_TYPE_REPLIES = {
+        'keto': (
+            "🥑 **Ketogenic Diet**\n\n"
+            "The ketogenic diet is very low in carbohydrates, moderate in protein, and high in fat:\n\n"
+            "- Typically 5-10% calories from carbs, 15-20% from protein, 70-80% from fat\n"
+            "- Aims to put body in ketosis, burning fat for fuel instead of carbs\n"
+            "- Can be effective for weight loss, blood sugar control, and certain medical conditions\n\n"
+            "Common foods include: meats, fatty fish, eggs, butter, oils, cheese, nuts, seeds, and low-carb vegetables.\n\n"
+            "Potential challenges include initial 'keto flu,' difficulty with adherence, and limited long-term research."
+        ),
+        'paleo': (
+            "🦖 **Paleo Diet**\n\n"
+            "The paleolithic diet focuses on foods presumed to be available to our hunter-gatherer ancestors:\n\n"
+            "- Emphasizes whole foods, eliminates processed foods and agricultural products\n"
+            "- Includes meats, fish, eggs, vegetables, fruits, nuts, and seeds\n"
+            "- Excludes grains, legumes, dairy, refined sugar, and salt\n\n"
+            "Benefits may include reduced inflammation and improved blood lipids for some people.\n\n"
+            "Criticisms include the difficulty of accurately recreating prehistoric diets and the exclusion of nutritious food groups like whole grains and legumes."
+        ),
+        'vegan': (
+            "🌱 **Vegan Diet**\n\n"
+            "A vegan diet excludes all animal products:\n\n"
+            "- Plant-based sources of protein include legumes, tofu, tempeh, seitan, and certain grains\n"
+            "- Nutrients requiring special attention: vitamin B12, omega-3s, iron, zinc, calcium, vitamin D\n"
+            "- Environmental and ethical benefits are commonly cited reasons for adoption\n\n"
+            "A well-planned vegan diet can be nutritionally complete with proper attention to key nutrients.\n\n"
+            "Consider supplementing vitamin B12, which is not naturally found in plant foods."
+        ),
+        'vegetarian': (
+            "🥚 **Vegetarian Diet**\n\n"
+            "Vegetarian diets exclude meat but vary in other animal product inclusion:\n\n"
+            "- Lacto-ovo vegetarians: include dairy and eggs\n"
+            "- Lacto vegetarians: include dairy, exclude eggs\n"
+            "- Ovo vegetarians: include eggs, exclude dairy\n\n"
+            "Protein sources include legumes, dairy (if included), eggs (if included), tofu, tempeh, and seitan.\n\n"
+            "A well-balanced vegetarian diet can provide all necessary nutrients, with special attention to iron, zinc, and vitamin B12 depending on the specific type."
+        ),
+        'mediterranean': (
+            "🫒 **Mediterranean Diet**\n\n"
+            "Based on traditional eating patterns of Mediterranean countries:\n\n"
+            "- Emphasizes vegetables, fruits, whole grains, legumes, nuts, seeds, and olive oil\n"
+            "- Includes moderate amounts of fish, poultry, eggs, and dairy\n"
+            "- Limits red meat and sweets\n"
+            "- Often includes moderate wine consumption with meals\n\n"
+            "One of the most well-researched dietary patterns, associated with reduced risk of heart disease, certain cancers, and cognitive decline.\n\n"
+            "Focuses on overall pattern rather than strict rules, making it adaptable and sustainable for many people."
+        ),
+        'low carb': (
+            "🥩 **Low-Carb Diet**\n\n"
+            "Low-carbohydrate diets restrict carbohydrate intake to varying degrees:\n\n"
+            "- Moderate low-carb: 100-150g carbs daily\n"
+            "- Low-carb: 50-100g carbs daily\n"
+            "- Very low-carb/keto: under 50g carbs daily\n\n"
+            "Protein and fat intake typically increase to compensate for reduced carbs.\n\n"
+            "May be effective for weight loss, blood sugar control, and reducing triglycerides. Individual response varies based on metabolism, activity level, and health status."
+        ),
+        'fasting': (
+            "⏱️ **Intermittent Fasting**\n\n"
+            "Cycling between periods of eating and fasting:\n\n"
+            "- 16:8 method: 16-hour fast, 8-hour eating window\n"
+            "- 5:2 method: 5 regular eating days, 2 very low-calorie days (500-600 calories)\n"
+            "- Alternate-day fasting: alternating between regular eating and fasting/very low-calorie days\n\n"
+            "Potential benefits include improved insulin sensitivity, cellular repair processes, and simplified meal planning.\n\n"
+            "Not recommended for pregnant/breastfeeding women, those with history of eating disorders, or those with certain medical conditions."
+        )
+    }
+    
+    # Zero-width lookahead, so overlapping keywords are all found
+    DIET_TYPE_REGEX = re.compile('(?=(' + '|'.join(re.escape(keyword) for keyword in DIET_TYPE_REPLIES) + '))')
+    
+    DIET_OVERVIEW = (
+        "There are many dietary approaches, each with potential benefits and considerations:\n\n"
+        "- Mediterranean: emphasizes vegetables, fruits, whole grains, olive oil, moderate dairy and fish\n"
+        "- Low-carb/Keto: restricts carbs, higher in protein and fats\n"
+        "- Vegetarian/Vegan: plant-focused with varying degrees of animal product restriction\n"
+        "- Paleo: based on foods presumed available to our ancestors (meats, fish, fruits, vegetables, nuts, seeds)\n"
+        "- Intermittent fasting: focuses on when you eat rather than what you eat\n\n"
+        "The best diet is one that provides adequate nutrition, works with your lifestyle, and that you can maintain long-term. Would you like details about a specific approach?"
+    )
+    
     def __init__(self, food_data, exercise_data, user_data=None):
         """
         Initialize the nutritional chatbot with food and exercise data
@@ -36,55 +226,180 @@ class NutritionChatbot:
             'health_condition': [r'diabetes', r'high blood pressure', r'hypertension', r'cholesterol', r'heart disease', r'celiac', r'gluten', r'allergy']
         }
         
-        # Compile regex patterns for each intent
-        self.intent_patterns = {}
-        for intent, patterns in self.intents.items():
-            self.intent_patterns[intent] = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        # Priority order (most specific to most general)
+        self.priority_order = [
+            'food_recommendation', 'exercise_recommendation',
+            'low_calorie', 'high_protein', 
+            'diet_type', 'health_condition',
+            'weight_loss', 'weight_gain',
+            'water_intake', 'meal_timing', 'vitamins', 'cheat_meal',
+            'nutrition_info', 'goal_setting',
+            'greeting', 'goodbye', 'thanks', 'help',
+            'general'
+        ]
+        
+        # Compile all intent patterns into one regex, one named lookahead per pattern.
+        # Alternatives are ordered by priority, so at every position the most specific intent wins
+        self.intent_regex = re.compile('|'.join(
+            f'(?=(?P<{intent}_{i}>{pattern}))'
+            for intent in self.priority_order if intent in self.intents
+            for i, pattern in enumerate(self.intents[intent])
+        ), re.IGNORECASE)
+        
+        # Priority rank of the intent behind each named group (lower is more specific)
+        self.intent_rank_by_group = {
+            f'{intent}_{i}': rank
+            for rank, intent in enumerate(self.priority_order) if intent in self.intents
+            for i in range(len(self.intents[intent]))
+        }
+        
+        # Repeated messages (greetings, thanks, help...) skip the regex scan entirely
+        self.cached_intent = lru_cache(maxsize=INTENT_CACHE_SIZE)(self.match_intent)
+        
+        # Response method for each intent
+        self.intent_responses = {
+            'greeting': self.greeting_response,
+            'goodbye': self.goodbye_response,
+            'thanks': self.thanks_response,
+            'help': self.help_response,
+            'food_recommendation': self.food_recommendation_response,
+            'low_calorie': self.low_calorie_response,
+            'high_protein': self.high_protein_response,
+            'exercise_recommendation': self.exercise_recommendation_response,
+            'nutrition_info': self.general_nutrition_response,
+            'goal_setting': self.goal_setting_response,
+            'water_intake': self.water_intake_response,
+            'meal_timing': self.meal_timing_response,
+            'cheat_meal': self.cheat_meal_response,
+            'vitamins': self.vitamins_response,
+            'weight_loss': self.weight_loss_response,
+            'weight_gain': self.weight_gain_response,
+            'health_condition': self.health_condition_response
+        }
+        
+        # Lowercase the food names once; they feed both the name index and the food filters
+        self.food_name_lc = (
+            food_data['Food Name'].fillna('').astype(str).str.lower()
+            if isinstance(food_data, pd.DataFrame) and 'Food Name' in food_data.columns else pd.Series(dtype=str)
+        )
+        
+        # Build name indexes once so each message is scanned in a single pass
+        self.food_name_matcher = self.build_name_matcher(self.food_name_lc)
+        self.exercise_name_matcher = self.build_name_matcher(
+            exercise_data['Exercise'].fillna('').astype(str).str.lower()
+            if isinstance(exercise_data, pd.DataFrame) and 'Exercise' in exercise_data.columns else []
+        )
+        
+        # Precompute the food filters used by the recommendation responses
+        if isinstance(food_data, pd.DataFrame) and not food_data.empty:
+            self.meat_mask = self.food_name_lc.str.contains('meat|chicken|beef|pork|fish|seafood').to_numpy()
+            self.animal_product_mask = self.food_name_lc.str.contains('milk|cheese|egg|yogurt|butter').to_numpy()
+            
+            # Column arrays, so food lookups read plain numpy values instead of DataFrame rows
+            self.food_name_arr = food_data['Food Name'].to_numpy(dtype=object)
+            self.calories_arr = food_data['Calories'].to_numpy(dtype=float)
+            self.protein_arr = food_data['Protein'].to_numpy(dtype=float)
+            self.carbs_arr = food_data['Carbs'].to_numpy(dtype=float)
+            self.fat_arr = food_data['Total Fat'].to_numpy(dtype=float)
+            self.healthy_mask = (self.calories_arr > 0) & (self.calories_arr < 500) & (self.protein_arr > 3)
+            self.low_cal_mask = (self.calories_arr > 0) & (self.calories_arr < 100)
+            self.high_protein_mask = (self.protein_arr > 10) & (self.calories_arr > 0)
+        
+        # Lowercase the muscle columns once instead of on every exercise query
+        if isinstance(exercise_data, pd.DataFrame) and not exercise_data.empty:
+            self.main_muscle_lc = exercise_data['Main Muscle'].fillna('').str.lower()
+            self.target_muscles_lc = exercise_data['Target Muscles'].fillna('').str.lower()
+    
+    def build_name_matcher(self, names):
+        """
+        Index names by their first few characters and map each name to its first row
+        """
+        index_by_name = {}
+        names_by_prefix = {}
+        for idx, name in enumerate(names):
+            if re.match(r'\w', name) and name not in index_by_name:
+                index_by_name[name] = idx
+                names_by_prefix.setdefault(name[:NAME_PREFIX_LENGTH], []).append(name)
+        
+        # Longest names first, so the first name found at a word is the longest one there
+        for candidates in names_by_prefix.values():
+            candidates.sort(key=len, reverse=True)
+        
+        return names_by_prefix, index_by_name
+    
+    def find_longest_name(self, text, matcher, min_length=1):
+        """
+        Find the longest known name mentioned in the text, returning (row position, name) or None.
+        Names must start at a word of the text but may end inside one, so plurals still match.
+        
+        >>> bot = NutritionChatbot(None, None)
+        >>> bot.find_longest_name('calories in bananas', bot.build_name_matcher(['banana', 'banana bread']))
+        (0, 'banana')
+        >>> bot.find_longest_name('pineapple juice', bot.build_name_matcher(['apple'])) is None
+        True
+        """
+        names_by_prefix, index_by_name = matcher
+        
+        best_name = None
+        for word in re.finditer(r'\w+', text):
+            start = word.start()
+            # Names shorter than the prefix length are indexed under their whole text
+            for length in range(1, NAME_PREFIX_LENGTH + 1):
+                for name in names_by_prefix.get(text[start:start + length], ()):
+                    if len(name) < min_length or (best_name is not None and len(name) <= len(best_name)):
+                        break
+                    if text.startswith(name, start):
+                        best_name = name
+                        break
+        
+        if best_name is None:
+            return None
+        return index_by_name[best_name], best_name
+    
+    def muscle_mask(self, muscle):
+        """
+        Boolean mask of the exercises that work the given (lowercase) muscle group
+        """
+        return (self.main_muscle_lc.str.contains(muscle, regex=False) |
+                self.target_muscles_lc.str.contains(muscle, regex=False))
+    
+    def random_exercise_for(self, muscle):
+        """
+        Pick a random exercise row for the muscle group, or None if no exercise works it
+        """
+        candidates = np.flatnonzero(self.muscle_mask(muscle).to_numpy())
+        if not candidates.size:
+            return None
+        return self.exercise_data.iloc[int(np.random.choice(candidates))]
     
     def detect_intent(self, message):
         """
         Detect the user's intent from their message
         """
-        message = message.lower()
-        
-        # Multiple intents can be found in a single message
-        matched_intents = []
-        
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if pattern.search(message):
-                    matched_intents.append(intent)
-                    break  # Found one match for this intent, move to next intent
-        
-        # If found exactly one intent, return it
-        if len(matched_intents) == 1:
-            return matched_intents[0]
-        
-        # If found multiple intents, prioritize specific intents over general ones
-        if len(matched_intents) > 1:
-            # Priority order (most specific to most general)
-            priority_order = [
-                'food_recommendation', 'exercise_recommendation',
-                'low_calorie', 'high_protein', 
-                'diet_type', 'health_condition',
-                'weight_loss', 'weight_gain',
-                'water_intake', 'meal_timing', 'vitamins', 'cheat_meal',
-                'nutrition_info', 'goal_setting',
-                'greeting', 'goodbye', 'thanks', 'help',
-                'general'
-            ]
-            
-            # Return the most specific matching intent
-            for intent in priority_order:
-                if intent in matched_intents:
-                    return intent
+        # Case, surrounding punctuation and repeated whitespace don't decide the intent,
+        # so near-identical messages ("Hi!", "hi", "  HI ") share a cache entry
+        key = ' '.join(message.lower().split()).strip(string.punctuation)
+        return self.cached_intent(key)
+    
+    def match_intent(self, message):
+        """
+        Match the message against all intent patterns and return the most specific intent
+        """
+        # Multiple intents can be found in a single message; one scan finds them all
+        # and the most specific one is the match with the lowest priority rank
+        best_rank = min(
+            (self.intent_rank_by_group[match.lastgroup] for match in self.intent_regex.finditer(message)),
+            default=None
+        )
         
         # If no intent is matched, return general intent
-        return 'general'
+        if best_rank is None:
+            return 'general'
+        return self.priority_order[best_rank]
     
     def detect_food_query(self, message):
         """
-        Check if the message is asking about a specific food
+        Check if the message is asking about a specific food, returning its row position or None
         """
         if not isinstance(self.food_data, pd.DataFrame) or self.food_data.empty:
             return None
@@ -93,17 +408,8 @@ class NutritionChatbot:
         message = message.lower()
         
         # First, check if this is about a specific food (using common phrase patterns)
-        food_query_patterns = [
-            r'what\'s in (.+)\??',
-            r'nutrients? in (.+)',
-            r'calories in (.+)',
-            r'how (healthy|nutritious) is (.+)\??',
-            r'tell me about (.+) nutrition',
-            r'macros? in (.+)'
-        ]
-        
-        for pattern in food_query_patterns:
-            match = re.search(pattern, message)
+        for pattern in self.FOOD_QUERY_PATTERNS:
+            match = pattern.search(message)
             if match:
                 # Get the food name from the regex match
                 if len(match.groups()) == 1:
@@ -111,34 +417,17 @@ class NutritionChatbot:
                 else:
                     food_term = match.group(2).strip()
                 
-                # Search for this food in our database
-                best_match = None
-                best_score = 0
+                # Search for the longest food name contained in the query term
+                found = self.find_longest_name(food_term, self.food_name_matcher)
                 
-                for _, food in self.food_data.iterrows():
-                    food_name = str(food.get('Food Name', '')).lower()
-                    
-                    # Check for exact match
-                    if food_name == food_term:
-                        return food
-                    
-                    # Check for food name contained in the query term
-                    if food_name and food_name in food_term:
-                        # Calculate match score based on length ratio
-                        score = len(food_name) / len(food_term)
-                        if score > best_score:
-                            best_score = score
-                            best_match = food
-                
-                # If we found a reasonable match (at least 50% of the query term)
-                if best_match is not None and best_score > 0.5:
-                    return best_match
+                # If we found a reasonable match (at least 50% of the query term; an exact match scores 1)
+                if found is not None and len(found[1]) / len(food_term) > 0.5:
+                    return found[0]
         
         # Fallback: Check if any food name in our database is directly mentioned
-        for _, food in self.food_data.iterrows():
-            food_name = str(food.get('Food Name', '')).lower()
-            if food_name and food_name in message and len(food_name) > 3:  # Avoid short names that could be common words
-                return food
+        found = self.find_longest_name(message, self.food_name_matcher, min_length=4)  # Avoid short names that could be common words
+        if found is not None:
+            return found[0]
         
         return None
     
@@ -153,16 +442,8 @@ class NutritionChatbot:
         message = message.lower()
         
         # First check if the message is asking about exercises for specific muscle groups
-        exercise_query_patterns = [
-            r'exercises? for (my )?(.*?) (muscles?|strength|training)',
-            r'how to (train|work|exercise) (my )?(.*?)( muscles?)?',
-            r'(best|good|recommended|top) (.*?) exercises?',
-            r'(strengthen|tone|build) (my )?(.*?)( muscles?)?',
-            r'what (exercises?|workouts?) (should I do|are good|can I do) for (my )?(.*?)( muscles?)?'
-        ]
-        
-        for pattern in exercise_query_patterns:
-            match = re.search(pattern, message)
+        for pattern in self.EXERCISE_QUERY_PATTERNS:
+            match = pattern.search(message)
             if match:
                 # Extract the muscle group from the match
                 matched_groups = match.groups()
@@ -173,68 +454,28 @@ class NutritionChatbot:
                     
                     if muscle_term:
                         # Check against known muscle groups
-                        muscle_groups = {
-                            'neck': 'neck', 
-                            'shoulder': 'shoulder', 'shoulders': 'shoulder',
-                            'upper arm': 'upper arms', 'bicep': 'upper arms', 'tricep': 'upper arms',
-                            'biceps': 'upper arms', 'triceps': 'upper arms', 'arm': 'upper arms',
-                            'arms': 'upper arms', 'upper body': 'upper arms',
-                            'forearm': 'forearm', 'forearms': 'forearm', 'wrist': 'forearm',
-                            'back': 'back', 'lats': 'back', 'traps': 'back',
-                            'chest': 'chest', 'pecs': 'chest', 'pectorals': 'chest',
-                            'hip': 'hips', 'hips': 'hips',
-                            'thigh': 'thighs', 'thighs': 'thighs', 'quad': 'thighs',
-                            'quads': 'thighs', 'quadriceps': 'thighs',
-                            'hamstring': 'thighs', 'hamstrings': 'thighs',
-                            'calf': 'calves', 'calves': 'calves', 'lower leg': 'calves',
-                            'waist': 'waist', 'abs': 'waist', 'abdominals': 'waist',
-                            'core': 'waist', 'stomach': 'waist', 'midsection': 'waist',
-                            'glute': 'hips', 'glutes': 'hips', 'butt': 'hips', 'buttocks': 'hips'
-                        }
-                        
-                        normalized_muscle = None
-                        for key, value in muscle_groups.items():
-                            if key in muscle_term:
-                                normalized_muscle = value
-                                break
+                        alias = self.MUSCLE_ALIAS_REGEX.search(muscle_term)
+                        normalized_muscle = self.MUSCLE_ALIASES[alias.group(0)] if alias else None
                         
                         if normalized_muscle:
                             # Return a suitable exercise for this muscle group
-                            matching_exercises = self.exercise_data[
-                                self.exercise_data['Main Muscle'].str.lower().str.contains(normalized_muscle, na=False) |
-                                self.exercise_data['Target Muscles'].str.lower().str.contains(normalized_muscle, na=False)
-                            ]
-                            
-                            if not matching_exercises.empty:
-                                return matching_exercises.sample(1).iloc[0]
+                            exercise = self.random_exercise_for(normalized_muscle)
+                            if exercise is not None:
+                                return exercise
         
         # Next, check for direct queries about specific exercises
-        for _, exercise in self.exercise_data.iterrows():
-            exercise_name = str(exercise.get('Exercise', '')).lower()
-            if exercise_name and (
-                exercise_name in message or
-                f"how to do {exercise_name}" in message or
-                f"what is {exercise_name}" in message or
-                f"tell me about {exercise_name}" in message
-            ):
-                return exercise
+        # (phrases like "how to do X" or "tell me about X" all contain the name itself)
+        found = self.find_longest_name(message, self.exercise_name_matcher)
+        if found is not None:
+            return self.exercise_data.iloc[found[0]]
         
         # Check if message directly mentions a specific muscle group
-        muscle_groups = [
-            'neck', 'shoulder', 'upper arms', 'forearm', 'back', 'chest', 
-            'hips', 'thighs', 'calves', 'waist', 'abs', 'core', 'glutes',
-            'quadriceps', 'hamstrings', 'biceps', 'triceps'
-        ]
-        
-        for muscle in muscle_groups:
+        for muscle in self.MUSCLE_GROUPS:
             if muscle in message:
                 # Return a random exercise for this muscle group
-                matching_exercises = self.exercise_data[
-                    self.exercise_data['Main Muscle'].str.lower().str.contains(muscle, na=False) |
-                    self.exercise_data['Target Muscles'].str.lower().str.contains(muscle, na=False)
-                ]
-                if not matching_exercises.empty:
-                    return matching_exercises.sample(1).iloc[0]
+                exercise = self.random_exercise_for(muscle)
+                if exercise is not None:
+                    return exercise
         
         return None
     
@@ -242,93 +483,66 @@ class NutritionChatbot:
         """
         Generate a response based on the user's message
         """
-        intent = self.detect_intent(message)
-        food_query = self.detect_food_query(message)
-        exercise_query = self.detect_exercise_query(message)
-        
         # If a specific food was mentioned, provide info about it
+        food_query = self.detect_food_query(message)
         if food_query is not None:
             return self.food_info_response(food_query)
         
         # If a specific exercise was mentioned, provide info about it
+        exercise_query = self.detect_exercise_query(message)
         if exercise_query is not None:
             return self.exercise_info_response(exercise_query)
         
-        # Otherwise, respond based on intent
-        if intent == 'greeting':
-            return self.greeting_response()
-        elif intent == 'goodbye':
-            return self.goodbye_response()
-        elif intent == 'thanks':
-            return self.thanks_response()
-        elif intent == 'help':
-            return self.help_response()
-        elif intent == 'food_recommendation':
-            return self.food_recommendation_response()
-        elif intent == 'low_calorie':
-            return self.low_calorie_response()
-        elif intent == 'high_protein':
-            return self.high_protein_response()
-        elif intent == 'exercise_recommendation':
-            return self.exercise_recommendation_response()
-        elif intent == 'nutrition_info':
-            return self.general_nutrition_response()
-        elif intent == 'goal_setting':
-            return self.goal_setting_response()
-        elif intent == 'water_intake':
-            return self.water_intake_response()
-        elif intent == 'meal_timing':
-            return self.meal_timing_response()
-        elif intent == 'cheat_meal':
-            return self.cheat_meal_response()
-        elif intent == 'vitamins':
-            return self.vitamins_response()
-        elif intent == 'weight_loss':
-            return self.weight_loss_response()
-        elif intent == 'weight_gain':
-            return self.weight_gain_response()
-        elif intent == 'diet_type':
+        # Otherwise, respond based on intent (only the diet type response needs the message)
+        intent = self.detect_intent(message)
+        if intent == 'diet_type':
             return self.diet_type_response(message)
-        elif intent == 'health_condition':
-            return self.health_condition_response()
-        else:
-            return self.general_response()
+        return self.intent_responses.get(intent, self.general_response)()
+    
+    def get_responses(self, messages):
+        """
+        Generate responses for a batch of messages, in order
+        """
+        # Repeated messages in a batch reuse the cached intent; replies are still drawn per message
+        return [self.get_response(message) for message in messages]
     
-    def food_info_response(self, food):
+    def food_info_response(self, food_idx):
         """
-        Generate response with information about a specific food
+        Generate response with information about the food at the given row position
         """
-        food_name = food.get('Food Name', 'this food')
-        calories = food.get('Calories', 0)
-        protein = food.get('Protein', 0)
-        carbs = food.get('Carbs', 0)
-        fat = food.get('Total Fat', 0)
-        
-        response = f"📊 **{food_name}** contains approximately:\n\n"
-        response += f"- Calories: {calories:.0f} kcal\n"
-        response += f"- Protein: {protein:.1f}g\n"
-        response += f"- Carbs: {carbs:.1f}g\n"
-        response += f"- Fat: {fat:.1f}g\n\n"
+        food_name = self.food_name_arr[food_idx]
+        calories = self.calories_arr[food_idx]
+        protein = self.protein_arr[food_idx]
+        carbs = self.carbs_arr[food_idx]
+        fat = self.fat_arr[food_idx]
+        
+        parts = [
+            f"📊 **{food_name}** contains approximately:\n\n",
+            f"- Calories: {calories:.0f} kcal\n",
+            f"- Protein: {protein:.1f}g\n",
+            f"- Carbs: {carbs:.1f}g\n",
+            f"- Fat: {fat:.1f}g\n\n"
+        ]
         
         # Add a recommendation based on the food's macros
         if protein > 15:
-            response += "This is a good source of protein! 💪\n"
+            parts.append("This is a good source of protein! 💪\n")
         if carbs > 30:
-            response += "This food is relatively high in carbohydrates. 🍚\n"
+            parts.append("This food is relatively high in carbohydrates. 🍚\n")
         if fat > 15:
-            response += "This contains a significant amount of fat. 🥑\n"
+            parts.append("This contains a significant amount of fat. 🥑\n")
         
         # Add a contextual suggestion
         user_goal = self.user_data.get('goal', '').lower() if self.user_data else ''
         
         if 'weight loss' in user_goal and calories > 300:
-            response += "\nTip: Since you're focused on weight loss, consider this as a more substantial meal and adjust portion sizes accordingly. 👍"
+            parts.append("\nTip: Since you're focused on weight loss, consider this as a more substantial meal and adjust portion sizes accordingly. 👍")
         elif 'muscle gain' in user_goal and protein > 10:
-            response += "\nTip: This food can be helpful for your muscle gain goals due to its protein content! 💪"
+            parts.append("\nTip: This food can be helpful for your muscle gain goals due to its protein content! 💪")
         else:
-            response += f"\nWould you like to know how {food_name} could fit into your meal plan? Just ask! 😊"
+            parts.append(f"\nWould you like to know how {food_name} could fit into your meal plan? Just ask! 😊")
         
-        return response
+        return "".join(parts)
     
     def exercise_info_response(self, exercise):
         """
@@ -340,57 +554,38 @@ class NutritionChatbot:
         preparation = exercise.get('Preparation', 'N/A')
         execution = exercise.get('Execution', 'N/A')
         
-        response = f"🏋️‍♂️ **{exercise_name}**\n\n"
-        response += f"**Type:** {equipment_type}\n"
-        response += f"**Target Muscles:** {target_muscles}\n\n"
+        parts = [
+            f"🏋️‍♂️ **{exercise_name}**\n\n",
+            f"**Type:** {equipment_type}\n",
+            f"**Target Muscles:** {target_muscles}\n\n"
+        ]
         
         if preparation and preparation != '0':
-            response += f"**Preparation:** {preparation}\n\n"
+            parts.append(f"**Preparation:** {preparation}\n\n")
         
         if execution and execution != '0':
-            response += f"**Execution:** {execution}\n\n"
+            parts.append(f"**Execution:** {execution}\n\n")
         
         # Add a contextual suggestion
         user_goal = self.user_data.get('goal', '').lower() if self.user_data else ''
         
         if 'muscle gain' in user_goal:
-            response += "Tip: For muscle gain, focus on controlled movements and gradually increasing resistance. 💪"
+            parts.append("Tip: For muscle gain, focus on controlled movements and gradually increasing resistance. 💪")
         elif 'weight loss' in user_goal:
-            response += "Tip: For weight loss, consider incorporating this into a circuit with minimal rest between exercises. 🔥"
+            parts.append("Tip: For weight loss, consider incorporating this into a circuit with minimal rest between exercises. 🔥")
         else:
-            response += "Remember to maintain proper form for safety and effectiveness! 👍"
+            parts.append("Remember to maintain proper form for safety and effectiveness! 👍")
         
-        return response
+        return "".join(parts)
     
     def greeting_response(self):
-        greetings = [
-            "Hello! How can I help with your nutrition or fitness today? 😊",
-            "Hi there! I'm your nutrition and fitness assistant. What can I help you with? 🥗🏋️‍♂️",
-            "Welcome! Looking for meal ideas or exercise tips? I'm here to help! 🍎",
-            "Hey! Ready to chat about nutrition and fitness? What's on your mind? 💪",
-            "Greetings! I'm here to help with your health and wellness questions. What do you need? 🌱"
-        ]
-        return random.choice(greetings)
+        return random.choice(self.GREETINGS)
     
     def goodbye_response(self):
-        goodbyes = [
-            "Goodbye! Remember to stay hydrated and make healthy choices! 🚰",
-            "Take care! Come back anytime for more nutrition and fitness tips. 👋",
-            "See you later! Keep up the great work on your health journey! 🌟",
-            "Farewell! Remember, consistency is key to achieving your health goals. 🔑",
-            "Bye for now! Looking forward to helping you again soon! 😊"
-        ]
-        return random.choice(goodbyes)
+        return random.choice(self.GOODBYES)
     
     def thanks_response(self):
-        responses = [
-            "You're welcome! I'm happy to help with your nutrition and fitness needs. 😊",
-            "My pleasure! Feel free to ask if you have any other questions. 👍",
-            "Glad I could help! Remember, small changes add up to big results over time. 🌱",
-            "Anytime! Consistency is key to reaching your health and fitness goals. 🔑",
-            "No problem! Stay motivated and keep making healthy choices! 💪"
-        ]
-        return random.choice(responses)
+        return random.choice(self.THANKS_REPLIES)
     
     def help_response(self):
         return (
@@ -420,103 +615,99 @@ class NutritionChatbot:
         
         # Filter by dietary preference if specified
         if diet_pref in ['vegetarian', 'vegan']:
-            filtered_foods = self.food_data[~self.food_data['Food Name'].str.lower().str.contains('meat|chicken|beef|pork|fish|seafood', na=False)]
+            allowed = ~self.meat_mask
             if diet_pref == 'vegan':
-                filtered_foods = filtered_foods[~filtered_foods['Food Name'].str.lower().str.contains('milk|cheese|egg|yogurt|butter', na=False)]
+                allowed = allowed & ~self.animal_product_mask
         else:
-            filtered_foods = self.food_data
+            allowed = np.ones(len(self.food_data), dtype=bool)
         
         # Get a few random, healthy food options
-        healthy_foods = filtered_foods[
-            (filtered_foods['Calories'] > 0) & 
-            (filtered_foods['Calories'] < 500) &
-            (filtered_foods['Protein'] > 3)
-        ]
+        candidates = np.flatnonzero(allowed & self.healthy_mask)
         
-        if healthy_foods.empty:
-            healthy_foods = filtered_foods
+        if candidates.size == 0:
+            candidates = np.flatnonzero(allowed)
         
         # Select 3-5 foods
-        sample_size = min(5, len(healthy_foods))
-        recommendations = healthy_foods.sample(sample_size)
+        sample_size = min(5, candidates.size)
+        recommendations = self.food_data.iloc[np.random.choice(candidates, sample_size, replace=False)]
         
-        response = "Based on your profile, I recommend these foods:\n\n"
+        parts = ["Based on your profile, I recommend these foods:\n\n"]
         
-        for _, food in recommendations.iterrows():
-            food_name = food.get('Food Name', 'Food')
-            calories = food.get('Calories', 0)
-            protein = food.get('Protein', 0)
-            
-            response += f"🍽️ **{food_name}** - {calories:.0f} calories, {protein:.1f}g protein\n"
+        parts.extend(
+            f"🍽️ **{food_name}** - {calories:.0f} calories, {protein:.1f}g protein\n"
+            for food_name, calories, protein in zip(
+                recommendations['Food Name'].to_numpy(),
+                recommendations['Calories'].to_numpy(),
+                recommendations['Protein'].to_numpy()
+            )
+        )
         
         # Add goal-specific advice
         if 'weight loss' in user_goal:
-            response += "\nThese options can help with weight loss due to their protein content and reasonable calorie levels. Remember to control portions and pair with plenty of vegetables! 🥦"
+            parts.append("\nThese options can help with weight loss due to their protein content and reasonable calorie levels. Remember to control portions and pair with plenty of vegetables! 🥦")
         elif 'muscle gain' in user_goal or 'weight gain' in user_goal:
-            response += "\nThese foods provide good nutrition for muscle building. Consider increasing portion sizes to meet your calorie needs for growth. 💪"
+            parts.append("\nThese foods provide good nutrition for muscle building. Consider increasing portion sizes to meet your calorie needs for growth. 💪")
         else:
-            response += "\nThese nutritious options can support your overall health and well-being. Variety is key to getting all the nutrients you need! 🌈"
+            parts.append("\nThese nutritious options can support your overall health and well-being. Variety is key to getting all the nutrients you need! 🌈")
         
-        return response
+        return "".join(parts)
     
     def low_calorie_response(self):
         if not isinstance(self.food_data, pd.DataFrame) or self.food_data.empty:
             return "Low-calorie foods include leafy greens, berries, broccoli, cauliflower, cucumber, lean proteins like chicken breast and white fish, and eggs. These foods provide nutrients while keeping calories low."
         
         # Find low calorie foods
-        low_cal_foods = self.food_data[
-            (self.food_data['Calories'] > 0) & 
-            (self.food_data['Calories'] < 100)
-        ].sort_values('Calories')
+        candidates = np.flatnonzero(self.low_cal_mask)
         
-        if low_cal_foods.empty:
+        if candidates.size == 0:
             return "I couldn't find specific low-calorie foods in my database, but generally, vegetables, lean proteins, and fruits are good low-calorie options."
         
-        # Select a few low calorie foods
-        sample_size = min(5, len(low_cal_foods))
-        recommendations = low_cal_foods.head(sample_size)
+        # Select a few of the lowest calorie foods
+        lowest = candidates[np.argsort(self.calories_arr[candidates], kind='stable')[:5]]
+        recommendations = self.food_data.iloc[lowest]
         
-        response = "Here are some low-calorie food options:\n\n"
+        parts = ["Here are some low-calorie food options:\n\n"]
         
-        for _, food in recommendations.iterrows():
-            food_name = food.get('Food Name', 'Food')
-            calories = food.get('Calories', 0)
-            
-            response += f"🥬 **{food_name}** - only {calories:.0f} calories\n"
+        parts.extend(
+            f"🥬 **{food_name}** - only {calories:.0f} calories\n"
+            for food_name, calories in zip(
+                recommendations['Food Name'].to_numpy(),
+                recommendations['Calories'].to_numpy()
+            )
+        )
         
-        response += "\nLow-calorie foods help create a calorie deficit for weight loss while still providing essential nutrients. Try building meals around these foods with plenty of vegetables! 🥗"
+        parts.append("\nLow-calorie foods help create a calorie deficit for weight loss while still providing essential nutrients. Try building meals around these foods with plenty of vegetables! 🥗")
         
-        return response
+        return "".join(parts)
     
     def high_protein_response(self):
         if not isinstance(self.food_data, pd.DataFrame) or self.food_data.empty:
             return "High-protein foods include chicken breast, turkey, fish, lean beef, eggs, Greek yogurt, cottage cheese, tofu, legumes, and protein supplements like whey protein. These support muscle recovery and growth."
         
         # Find high protein foods
-        high_protein_foods = self.food_data[
-            (self.food_data['Protein'] > 10) & 
-            (self.food_data['Calories'] > 0)
-        ].sort_values('Protein', ascending=False)
+        candidates = np.flatnonzero(self.high_protein_mask)
         
-        if high_protein_foods.empty:
+        if candidates.size == 0:
             return "I couldn't find specific high-protein foods in my database, but chicken, fish, eggs, dairy, legumes, and tofu are excellent protein sources."
         
-        # Select a few high protein foods
-        sample_size = min(5, len(high_protein_foods))
-        recommendations = high_protein_foods.head(sample_size)
+        # Select a few of the highest protein foods
+        highest = candidates[np.argsort(-self.protein_arr[candidates], kind='stable')[:5]]
+        recommendations = self.food_data.iloc[highest]
         
-        response = "Here are some high-protein food options:\n\n"
+        parts = ["Here are some high-protein food options:\n\n"]
         
-        for _, food in recommendations.iterrows():
-            food_name = food.get('Food Name', 'Food')
-            protein = food.get('Protein', 0)
-            calories = food.get('Calories', 0)
-            
-            response += f"💪 **{food_name}** - {protein:.1f}g protein, {calories:.0f} calories\n"
+        parts.extend(
+            f"💪 **{food_name}** - {protein:.1f}g protein, {calories:.0f} calories\n"
+            for food_name, protein, calories in zip(
+                recommendations['Food Name'].to_numpy(),
+                recommendations['Protein'].to_numpy(),
+                recommendations['Calories'].to_numpy()
+            )
+        )
         
-        response += "\nProtein is essential for muscle repair and growth. Aim to consume protein throughout the day, especially after workouts! 🏋️‍♂️"
+        parts.append("\nProtein is essential for muscle repair and growth. Aim to consume protein throughout the day, especially after workouts! 🏋️‍♂️")
         
-        return response
+        return "".join(parts)
     
     def exercise_recommendation_response(self):
         if not isinstance(self.exercise_data, pd.DataFrame) or self.exercise_data.empty:
@@ -527,15 +718,15 @@ class NutritionChatbot:
         
         # Select exercises based on goal
         if 'weight loss' in user_goal:
-            exercise_focus = ['Cardio', 'HIIT', 'Circuit']
+            exercise_focus = self.EXERCISE_FOCUS_PATTERNS['weight loss']
         elif 'muscle gain' in user_goal:
-            exercise_focus = ['Strength', 'Resistance', 'Weight']
+            exercise_focus = self.EXERCISE_FOCUS_PATTERNS['muscle gain']
         else:
-            exercise_focus = ['Stretch', 'Cardio', 'Strength']
+            exercise_focus = self.EXERCISE_FOCUS_PATTERNS['general']
         
         # Filter exercises
         filtered_exercises = self.exercise_data[
-            self.exercise_data['Equipment Type'].str.contains('|'.join(exercise_focus), case=False, na=False)
+            self.exercise_data['Equipment Type'].str.contains(exercise_focus, na=False)
         ]
         
         if filtered_exercises.empty:
@@ -545,40 +736,29 @@ class NutritionChatbot:
         sample_size = min(5, len(filtered_exercises))
         recommendations = filtered_exercises.sample(sample_size)
         
-        response = "Here are some exercise recommendations:\n\n"
+        parts = ["Here are some exercise recommendations:\n\n"]
         
-        for _, exercise in recommendations.iterrows():
-            exercise_name = exercise.get('Exercise', 'Exercise')
-            equipment = exercise.get('Equipment Type', 'N/A')
-            target = exercise.get('Main Muscle', 'muscles')
-            
-            response += f"🏋️‍♂️ **{exercise_name}** ({equipment}) - Targets: {target}\n"
+        parts.extend(
+            f"🏋️‍♂️ **{exercise_name}** ({equipment}) - Targets: {target}\n"
+            for exercise_name, equipment, target in zip(
+                recommendations['Exercise'].to_numpy(),
+                recommendations['Equipment Type'].to_numpy(),
+                recommendations['Main Muscle'].to_numpy()
+            )
+        )
         
         # Add goal-specific advice
         if 'weight loss' in user_goal:
-            response += "\nFor weight loss, focus on creating a calorie deficit through a mix of cardio and strength training. Aim for consistency rather than intensity when starting out! 🔥"
+            parts.append("\nFor weight loss, focus on creating a calorie deficit through a mix of cardio and strength training. Aim for consistency rather than intensity when starting out! 🔥")
         elif 'muscle gain' in user_goal:
-            response += "\nFor muscle gain, focus on progressive overload by gradually increasing weight or reps. Don't forget that adequate protein and recovery are essential! 💪"
+            parts.append("\nFor muscle gain, focus on progressive overload by gradually increasing weight or reps. Don't forget that adequate protein and recovery are essential! 💪")
         else:
-            response += "\nA balanced approach to fitness includes strength, cardio, and flexibility work. Listen to your body and adjust intensity as needed! 🌟"
+            parts.append("\nA balanced approach to fitness includes strength, cardio, and flexibility work. Listen to your body and adjust intensity as needed! 🌟")
         
-        return response
+        return "".join(parts)
     
     def general_nutrition_response(self):
-        nutrition_facts = [
-            "Protein contains 4 calories per gram and is essential for muscle repair and growth. 💪",
-            "Carbohydrates provide 4 calories per gram and are your body's primary energy source. 🍚",
-            "Fats contain 9 calories per gram and are important for hormone production and vitamin absorption. 🥑",
-            "Dietary fiber supports digestive health and can help manage hunger. Most adults should aim for 25-30g daily. 🌱",
-            "Staying hydrated is crucial - aim for around 3-4 liters of water daily, more if you're active or in hot weather. 💧",
-            "Micronutrients (vitamins and minerals) don't provide calories but are essential for health and metabolism. 🍎",
-            "Meal timing is less important than total daily nutrition, but spreading protein intake throughout the day can benefit muscle protein synthesis. ⏰",
-            "Whole foods typically provide better nutrition than processed alternatives, with more fiber and micronutrients. 🥦",
-            "A balanced plate includes protein, complex carbs, healthy fats, and plenty of colorful vegetables. 🍽️",
-            "The thermic effect of food means your body burns calories digesting what you eat - protein has the highest thermic effect. 🔥"
-        ]
-        
-        return random.choice(nutrition_facts)
+        return random.choice(self.NUTRITION_FACTS)
     
     def goal_setting_response(self):
         return (
@@ -694,89 +874,15 @@ class NutritionChatbot:
         )
     
     def diet_type_response(self, message):
-        message = message.lower()
-        
-        if 'keto' in message:
-            return (
-                "🥑 **Ketogenic Diet**\n\n"
-                "The ketogenic diet is very low in carbohydrates, moderate in protein, and high in fat:\n\n"
-                "- Typically 5-10% calories from carbs, 15-20% from protein, 70-80% from fat\n"
-                "- Aims to put body in ketosis, burning fat for fuel instead of carbs\n"
-                "- Can be effective for weight loss, blood sugar control, and certain medical conditions\n\n"
-                "Common foods include: meats, fatty fish, eggs, butter, oils, cheese, nuts, seeds, and low-carb vegetables.\n\n"
-                "Potential challenges include initial 'keto flu,' difficulty with adherence, and limited long-term research."
-            )
-        elif 'paleo' in message:
-            return (
-                "🦖 **Paleo Diet**\n\n"
-                "The paleolithic diet focuses on foods presumed to be available to our hunter-gatherer ancestors:\n\n"
-                "- Emphasizes whole foods, eliminates processed foods and agricultural products\n"
-                "- Includes meats, fish, eggs, vegetables, fruits, nuts, and seeds\n"
-                "- Excludes grains, legumes, dairy, refined sugar, and salt\n\n"
-                "Benefits may include reduced inflammation and improved blood lipids for some people.\n\n"
-                "Criticisms include the difficulty of accurately recreating prehistoric diets and the exclusion of nutritious food groups like whole grains and legumes."
-            )
-        elif 'vegan' in message:
-            return (
-                "🌱 **Vegan Diet**\n\n"
-                "A vegan diet excludes all animal products:\n\n"
-                "- Plant-based sources of protein include legumes, tofu, tempeh, seitan, and certain grains\n"
-                "- Nutrients requiring special attention: vitamin B12, omega-3s, iron, zinc, calcium, vitamin D\n"
-                "- Environmental and ethical benefits are commonly cited reasons for adoption\n\n"
-                "A well-planned vegan diet can be nutritionally complete with proper attention to key nutrients.\n\n"
-                "Consider supplementing vitamin B12, which is not naturally found in plant foods."
-            )
-        elif 'vegetarian' in message:
-            return (
-                "🥚 **Vegetarian Diet**\n\n"
-                "Vegetarian diets exclude meat but vary in other animal product inclusion:\n\n"
-                "- Lacto-ovo vegetarians: include dairy and eggs\n"
-                "- Lacto vegetarians: include dairy, exclude eggs\n"
-                "- Ovo vegetarians: include eggs, exclude dairy\n\n"
-                "Protein sources include legumes, dairy (if included), eggs (if included), tofu, tempeh, and seitan.\n\n"
-                "A well-balanced vegetarian diet can provide all necessary nutrients, with special attention to iron, zinc, and vitamin B12 depending on the specific type."
-            )
-        elif 'mediterranean' in message:
-            return (
-                "🫒 **Mediterranean Diet**\n\n"
-                "Based on traditional eating patterns of Mediterranean countries:\n\n"
-                "- Emphasizes vegetables, fruits, whole grains, legumes, nuts, seeds, and olive oil\n"
-                "- Includes moderate amounts of fish, poultry, eggs, and dairy\n"
-                "- Limits red meat and sweets\n"
-                "- Often includes moderate wine consumption with meals\n\n"
-                "One of the most well-researched dietary patterns, associated with reduced risk of heart disease, certain cancers, and cognitive decline.\n\n"
-                "Focuses on overall pattern rather than strict rules, making it adaptable and sustainable for many people."
-            )
-        elif 'low carb' in message or 'low-carb' in message:
-            return (
-                "🥩 **Low-Carb Diet**\n\n"
-                "Low-carbohydrate diets restrict carbohydrate intake to varying degrees:\n\n"
-                "- Moderate low-carb: 100-150g carbs daily\n"
-                "- Low-carb: 50-100g carbs daily\n"
-                "- Very low-carb/keto: under 50g carbs daily\n\n"
-                "Protein and fat intake typically increase to compensate for reduced carbs.\n\n"
-                "May be effective for weight loss, blood sugar control, and reducing triglycerides. Individual response varies based on metabolism, activity level, and health status."
-            )
-        elif 'intermittent fasting' in message or 'fasting' in message:
-            return (
-                "⏱️ **Intermittent Fasting**\n\n"
-                "Cycling between periods of eating and fasting:\n\n"
-                "- 16:8 method: 16-hour fast, 8-hour eating window\n"
-                "- 5:2 method: 5 regular eating days, 2 very low-calorie days (500-600 calories)\n"
-                "- Alternate-day fasting: alternating between regular eating and fasting/very low-calorie days\n\n"
-                "Potential benefits include improved insulin sensitivity, cellular repair processes, and simplified meal planning.\n\n"
-                "Not recommended for pregnant/breastfeeding women, those with history of eating disorders, or those with certain medical conditions."
-            )
-        else:
-            return (
-                "There are many dietary approaches, each with potential benefits and considerations:\n\n"
-                "- Mediterranean: emphasizes vegetables, fruits, whole grains, olive oil, moderate dairy and fish\n"
-                "- Low-carb/Keto: restricts carbs, higher in protein and fats\n"
-                "- Vegetarian/Vegan: plant-focused with varying degrees of animal product restriction\n"
-                "- Paleo: based on foods presumed available to our ancestors (meats, fish, fruits, vegetables, nuts, seeds)\n"
-                "- Intermittent fasting: focuses on when you eat rather than what you eat\n\n"
-                "The best diet is one that provides adequate nutrition, works with your lifestyle, and that you can maintain long-term. Would you like details about a specific approach?"
-            )
+        # 'low-carb' and 'low carb' share a description
+        message = message.lower().replace('-', ' ')
+        
+        # One scan finds every diet keyword; the table order decides between them
+        mentioned = {match.group(1) for match in self.DIET_TYPE_REGEX.finditer(message)}
+        for keyword, reply in self.DIET_TYPE_REPLIES.items():
+            if keyword in mentioned:
+                return reply
+        return self.DIET_OVERVIEW
     
     def health_condition_response(self):
         return (
@@ -791,11 +897,4 @@ class NutritionChatbot:
         )
     
     def general_response(self):
-        general_responses = [
-            "I'm not sure I understand. Could you rephrase that or ask about a specific food, exercise, or nutrition topic? 🤔",
-            "I'd love to help you with nutrition or fitness! Try asking about a specific food, exercise recommendations, or general health tips. 🍎",
-            "I can provide information about food nutrition, exercise recommendations, and healthy lifestyle tips. What specifically would you like to know about? 💪",
-            "Feel free to ask me about food nutrition, exercise suggestions, or general health advice. I'm here to help! 🥗",
-            "If you're looking for nutrition or fitness guidance, I can help! Try asking about specific foods, workout recommendations, or health goals. 🏋️‍♂️"
-        ]
-        return random.choice(general_responses)
+        return random.choice(self.GENERAL_REPLIES)
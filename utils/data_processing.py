@@ -1,9 +1,28 @@
 import pandas as pd
+import numpy as np
+import pyarrow.parquet as pq
+import streamlit as st
 import json
 import os
+import re
+import shutil
+import time
+import tempfile
+import queue
+import atexit
+import threading
 from datetime import datetime
+from functools import lru_cache
 from utils.db import logs_collection, meal_plans_collection, journal_collection
 
+# Log events are queued and written by a background thread, several per insert
+LOG_FLUSH_INTERVAL = 0.1  # seconds to wait for more events before writing
+LOG_BATCH_SIZE = 500
+pending_logs = queue.Queue()
+logs_waiting = threading.Event()
+log_writer = None
+log_writer_lock = threading.Lock()
+
 def load_journal_entry(user_id, entry):
     try:
         journal_collection.insert_one({
@@ -15,36 +34,100 @@ def load_journal_entry(user_id, entry):
     except Exception as e:
         return False, f"Error saving journal entry: {str(e)}"
 
-def load_system_logs(limit=100):
+# Fields of a log document shown in the admin log view
+LOG_FIELDS = {"_id": 0, "timestamp": 1, "type": 1, "message": 1}
+
+def load_system_logs(type_filter="All", keyword="", limit=100):
     try:
-        logs_cursor = logs_collection.find().sort("timestamp", -1).limit(limit)
-        logs = list(logs_cursor)
-        return logs
+        query = {}
+        if type_filter != "All":
+            query["type"] = type_filter.lower()
+        if keyword:
+            query["message"] = {"$regex": re.escape(keyword), "$options": "i"}
+
+        # Hand back the cursor so callers render logs as the batch arrives; only the rendered fields are fetched
+        return logs_collection.find(query, LOG_FIELDS).sort("timestamp", -1).limit(limit).batch_size(limit)
     except Exception as e:
         print(f"Error loading logs: {e}")
         return []
     
-def load_user_logs(user_id=None, limit=100):
+def load_log_summary(since):
+    """
+    Count log events per type since the given datetime, grouped by the database
+    
+    Returns:
+    - List of {"type", "count"} dicts, most frequent first
+    """
+    try:
+        return list(logs_collection.aggregate([
+            {"$match": {"timestamp": {"$gte": since}}},
+            {"$group": {"_id": "$type", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+            {"$project": {"_id": 0, "type": "$_id", "count": 1}}
+        ]))
+    except Exception as e:
+        print(f"Error loading log summary: {e}")
+        return []
+
+def load_user_logs(user_id=None, limit=100, projection=None):
     try:
         query = {}
         
         if user_id:
             query["user_id"] = user_id  # Filter logs where user_id matches
 
-        logs_cursor = meal_plans_collection.find(query).sort("timestamp", -1).limit(limit)
-        logs = list(logs_cursor)
-        return logs
+        # Return the cursor so callers can stream or stop early; pass a projection such as
+        # {"meal_plan": 0} when only the plan metadata is needed
+        return meal_plans_collection.find(query, projection).sort("created_at", -1).limit(limit)
     except Exception as e:
         print(f"Error loading user logs: {e}")
         return []
     
+def flush_logs():
+    """
+    Write all queued log events, up to LOG_BATCH_SIZE per insert
+    """
+    while True:
+        batch = []
+        try:
+            while len(batch) < LOG_BATCH_SIZE:
+                batch.append(pending_logs.get_nowait())
+        except queue.Empty:
+            pass
+        if not batch:
+            return
+        try:
+            logs_collection.insert_many(batch, ordered=False)
+        except Exception as e:
+            print(f"Error writing logs: {e}")
+
+def write_logs_in_background():
+    while True:
+        logs_waiting.wait()
+        # Let events that arrive together share one insert
+        time.sleep(LOG_FLUSH_INTERVAL)
+        logs_waiting.clear()
+        flush_logs()
+
+# Don't lose events still queued when the process exits
+atexit.register(flush_logs)
+
 def log_event(event_type, message, user_id=None):
-    logs_collection.insert_one({
+    global log_writer
+    pending_logs.put({
         "timestamp": datetime.now(),
         "type": event_type,
         "message": message,
         "user_id": user_id
     })
+    
+    # Start the writer thread on first use
+    if log_writer is None:
+        with log_writer_lock:
+            if log_writer is None:
+                log_writer = threading.Thread(target=write_logs_in_background, daemon=True)
+                log_writer.start()
+    logs_waiting.set()
 
 def load_food_data():
     """
@@ -99,32 +182,89 @@ def save_user_records(user_records):
     """
     Save user records to JSON file
     """
+    records_path = 'attached_assets/records.json'
+    tmp_path = None
     try:
-        with open('attached_assets/records.json', 'w') as f:
+        # Write to a temporary file next to the records and swap it in, so a failed write can't truncate them
+        with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(records_path), suffix='.tmp', delete=False) as f:
+            tmp_path = f.name
             json.dump(user_records, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        # The temporary file is created owner-only; give it the permissions the records file would have
+        if os.path.exists(records_path):
+            shutil.copymode(records_path, tmp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, records_path)
         return True
     except Exception as e:
         print(f"Error saving user records: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
         return False
 
-def calculate_bmi(weight, height):
+# Daily energy expenditure multipliers by activity level
+ACTIVITY_MULTIPLIERS = {
+    'sedentary': 1.2,  # Little or no exercise
+    'lightly_active': 1.375,  # Light exercise 1-3 days per week
+    'moderately_active': 1.55,  # Moderate exercise 3-5 days per week
+    'very_active': 1.725,  # Hard exercise 6-7 days per week
+    'extra_active': 1.9  # Very hard exercise & physical job or training twice a day
+}
+
+# Calorie adjustment by goal keyword, checked in order
+GOAL_CALORIE_ADJUSTMENTS = {
+    'weight loss': -500,  # 500 calorie deficit
+    'weight gain': 500,   # 500 calorie surplus
+    'maintain weight': 0,
+    'muscle gain': 300,   # Moderate surplus for muscle gain
+    'not specified': 0
+}
+
+# (protein, fat, carbs) shares of calories by goal keyword, checked in order
+GOAL_MACRO_SPLITS = {
+    'muscle gain': (0.30, 0.25, 0.45),  # Higher protein for muscle gain
+    'weight loss': (0.35, 0.30, 0.35),  # Higher protein, moderate fat, lower carbs for weight loss
+    'weight gain': (0.20, 0.30, 0.50)   # Balanced macros with emphasis on carbs for weight gain
+}
+DEFAULT_MACRO_SPLIT = (0.25, 0.30, 0.45)
+
+def calculate_bmi_batch(weights, heights):
     """
-    Calculate BMI given weight in kg and height in cm
+    Calculate BMI for many users at once
+    
+    Parameters:
+    - weights: array of weights in kg
+    - heights: array of heights in cm
+    
+    Returns:
+    - (bmi array, status array); users without a positive height get NaN and "Unknown"
     """
-    height_in_meters = height / 100
-    bmi = weight / (height_in_meters ** 2)
+    heights_in_meters = np.asarray(heights, dtype=float) / 100
+    valid = heights_in_meters > 0
+    bmi = np.full(valid.shape, np.nan)
+    np.divide(np.asarray(weights, dtype=float), heights_in_meters ** 2, out=bmi, where=valid)
     
     # Determine BMI status
-    if bmi < 18.5:
-        status = "Underweight"
-    elif 18.5 <= bmi < 25:
-        status = "Healthy"
-    elif 25 <= bmi < 30:
-        status = "Overweight"
-    else:
-        status = "Obese"
-        
-    return round(bmi, 2), status
+    status = np.select(
+        [~valid, bmi < 18.5, bmi < 25, bmi < 30],
+        ["Unknown", "Underweight", "Healthy", "Overweight"],
+        default="Obese"
+    )
+    
+    return bmi, status
+
+def calculate_bmi(weight, height):
+    """
+    Calculate BMI given weight in kg and height in cm
+    """
+    if height == 0:
+        raise ZeroDivisionError("height must be non-zero to calculate BMI")
+    bmi, status = calculate_bmi_batch([weight], [height])
+    return round(float(bmi[0]), 2), str(status[0])
 
 def calculate_calorie_needs(weight, height, age, gender, activity_level, goal):
     """
@@ -147,34 +287,16 @@ def calculate_calorie_needs(weight, height, age, gender, activity_level, goal):
     else:
         bmr = 10 * weight + 6.25 * height - 5 * age - 161
     
-    # Apply activity multiplier
-    activity_multipliers = {
-        'sedentary': 1.2,  # Little or no exercise
-        'lightly_active': 1.375,  # Light exercise 1-3 days per week
-        'moderately_active': 1.55,  # Moderate exercise 3-5 days per week
-        'very_active': 1.725,  # Hard exercise 6-7 days per week
-        'extra_active': 1.9  # Very hard exercise & physical job or training twice a day
-    }
-    
-    # Default to moderately active if not specified
-    activity_multiplier = activity_multipliers.get(activity_level.lower(), 1.55)
+    # Apply activity multiplier, defaulting to moderately active if not specified
+    activity_multiplier = ACTIVITY_MULTIPLIERS.get(activity_level.lower(), 1.55)
     
     tdee = bmr * activity_multiplier
     
-    # Adjust based on goal
-    goal_adjustments = {
-        'weight loss': -500,  # 500 calorie deficit
-        'weight gain': 500,   # 500 calorie surplus
-        'maintain weight': 0,
-        'muscle gain': 300,   # Moderate surplus for muscle gain
-        'not specified': 0
-    }
-    
     # Clean up goal text and default to no adjustment if goal not recognized
     clean_goal = goal.lower().strip()
     calorie_adjustment = 0
     
-    for key, value in goal_adjustments.items():
+    for key, value in GOAL_CALORIE_ADJUSTMENTS.items():
         if key in clean_goal:
             calorie_adjustment = value
             break
@@ -193,26 +315,12 @@ def calculate_macros(calories, goal):
     """
     goal = goal.lower() if goal else ""
     
-    if "muscle gain" in goal:
-        # Higher protein for muscle gain
-        protein_pct = 0.30
-        fat_pct = 0.25
-        carbs_pct = 0.45
-    elif "weight loss" in goal:
-        # Higher protein, moderate fat, lower carbs for weight loss
-        protein_pct = 0.35
-        fat_pct = 0.30
-        carbs_pct = 0.35
-    elif "weight gain" in goal:
-        # Balanced macros with emphasis on carbs for weight gain
-        protein_pct = 0.20
-        fat_pct = 0.30
-        carbs_pct = 0.50
-    else:
-        # Balanced distribution for maintenance or unspecified
-        protein_pct = 0.25
-        fat_pct = 0.30
-        carbs_pct = 0.45
+    # Balanced distribution for maintenance or unspecified
+    protein_pct, fat_pct, carbs_pct = DEFAULT_MACRO_SPLIT
+    for key, split in GOAL_MACRO_SPLITS.items():
+        if key in goal:
+            protein_pct, fat_pct, carbs_pct = split
+            break
     
     # Calculate grams of each macronutrient
     protein_grams = (calories * protein_pct) / 4  # 4 calories per gram of protein
@@ -226,49 +334,57 @@ def calculate_macros(calories, goal):
         "fat": round(fat_grams)
     }
 
-def load_optimized_meals():
+# The dataset loaders share one frame across all sessions without copying it; treat the frames as read-only
+@st.cache_resource(show_spinner=False)
+def load_optimized_meals(columns=None):
     """
     Load the optimized meals dataset for meal planning
+    
+    Parameters:
+    - columns: Optional list of columns to load (all columns by default)
     """
     try:
-        # Load the recipes dataframe from parquet file
-        recipes_df = pd.read_parquet('attached_assets/optimized_recipes.parquet')
-        return recipes_df
+        # Load the recipes dataframe from parquet file, memory-mapped and only the requested columns
+        recipes_df = pq.read_table('attached_assets/optimized_recipes.parquet', columns=columns, memory_map=True).to_pandas()
+        
+        # Only a handful of meal types repeat across all recipes; store them as small integer codes
+        if 'meal_type' in recipes_df.columns:
+            recipes_df['meal_type'] = recipes_df['meal_type'].astype('category')
+        return add_recipe_search_columns(recipes_df)
     except Exception as e:
         print(f"Error loading optimized meals data: {e}")
         # Return empty DataFrame if file not found or other error
         return pd.DataFrame()
 
+# Food name keywords excluded by each dietary preference
+MEAT_KEYWORDS = ['beef', 'chicken', 'pork', 'lamb', 'turkey', 'duck', 'veal', 
+                 'ham', 'bacon', 'sausage', 'salmon', 'fish', 'seafood', 'shrimp',
+                 'crab', 'lobster', 'meatball', 'meatloaf', 'steak']
+ANIMAL_KEYWORDS = ['beef', 'chicken', 'pork', 'lamb', 'turkey', 'duck', 'veal', 
+                   'ham', 'bacon', 'sausage', 'salmon', 'fish', 'seafood', 'shrimp',
+                   'crab', 'lobster', 'cheese', 'milk', 'cream', 'butter', 'egg',
+                   'yogurt', 'honey', 'meat', 'whey', 'casein', 'gelatin']
+
+# Compiled once; case-insensitive so the food names don't need lowercasing first
+EXCLUDED_FOOD_PATTERNS = {
+    'vegetarian': re.compile('|'.join(MEAT_KEYWORDS), re.IGNORECASE),
+    'vegan': re.compile('|'.join(ANIMAL_KEYWORDS), re.IGNORECASE)
+}
+
 def filter_foods_by_preference(food_data, diet_preference):
     """
     Filter foods based on user's dietary preference
     """
     # For simplicity, we'll use some keywords to filter foods
-    if diet_preference.lower() == 'vegetarian':
-        # Filter out obvious meat-containing foods
-        meat_keywords = ['beef', 'chicken', 'pork', 'lamb', 'turkey', 'duck', 'veal', 
-                        'ham', 'bacon', 'sausage', 'salmon', 'fish', 'seafood', 'shrimp',
-                        'crab', 'lobster', 'meatball', 'meatloaf', 'steak']
-        
-        # Create a filter condition based on food names not containing meat keywords
-        filter_condition = ~food_data['Food Name'].str.lower().str.contains('|'.join(meat_keywords), na=False)
-        
-        return food_data[filter_condition]
-        
-    elif diet_preference.lower() == 'vegan':
-        # Filter out animal products
-        animal_keywords = ['beef', 'chicken', 'pork', 'lamb', 'turkey', 'duck', 'veal', 
-                          'ham', 'bacon', 'sausage', 'salmon', 'fish', 'seafood', 'shrimp',
-                          'crab', 'lobster', 'cheese', 'milk', 'cream', 'butter', 'egg',
-                          'yogurt', 'honey', 'meat', 'whey', 'casein', 'gelatin']
-        
-        filter_condition = ~food_data['Food Name'].str.lower().str.contains('|'.join(animal_keywords), na=False)
-        
-        return food_data[filter_condition]
-        
-    else:
+    excluded_pattern = EXCLUDED_FOOD_PATTERNS.get(diet_preference.lower())
+    if excluded_pattern is None:
         # Return all foods for 'both' or any other preference
         return food_data
+    
+    # Keep the foods whose names don't contain any excluded keyword
+    filter_condition = ~food_data['Food Name'].str.contains(excluded_pattern, na=False)
+    
+    return food_data[filter_condition]
 
 def filter_recipes_by_allergies_and_cuisines(recipes_df, allergies=None, preferred_cuisines=None):
     """
@@ -280,12 +396,13 @@ def filter_recipes_by_allergies_and_cuisines(recipes_df, allergies=None, preferr
     - preferred_cuisines: List of preferred cuisines
     
     Returns:
-    - Filtered DataFrame
+    - Filtered DataFrame (a selection of recipes_df rows; copy it before modifying)
     """
     if recipes_df.empty:
         return recipes_df
         
-    filtered_df = recipes_df.copy()
+    # Rows still allowed; the frame is indexed once at the end
+    keep = np.ones(len(recipes_df), dtype=bool)
     
     # Filter by allergies if provided
     if allergies and len(allergies) > 0:
@@ -295,45 +412,104 @@ def filter_recipes_by_allergies_and_cuisines(recipes_df, allergies=None, preferr
         else:
             allergies = [a.strip().lower() for a in allergies]
         
+        # Ignore blanks left by stray commas (an empty allergen would match every recipe) and duplicates
+        allergies = list(dict.fromkeys(allergen for allergen in allergies if allergen))
+        
         # Only apply filter if we have valid allergies
         if allergies:
             print(f"Filtering recipes for allergies: {allergies}")
-            allergies = [allergen.lower() for allergen in allergies]
-
-            filtered_df = filtered_df[
-                ~(
-                    filtered_df['ingredients'].apply(
-                        lambda ingredients: any(
-                            allergen in ingredient.lower()
-                            for ingredient in ingredients
-                            for allergen in allergies
-                        )
-                    ) |
-                    filtered_df['name'].str.lower().apply(
-                        lambda name: any(
-                            allergen == word
-                            for word in name.split()
-                            for allergen in allergies
-                        )
-                    )
-                )
-            ]
+            
+            ingredient_pattern, name_pattern = compile_allergen_patterns(tuple(allergies))
+            has_allergen = recipe_search_text(recipes_df, 'ingredients').str.contains(ingredient_pattern)
+            if name_pattern is not None:
+                has_allergen |= recipe_search_text(recipes_df, 'name').str.contains(name_pattern, na=False)
+            
+            keep &= ~has_allergen.to_numpy()
     
     # Filter by cuisines if provided
     if preferred_cuisines and len(preferred_cuisines) > 0:
         # Only apply cuisine filter if we still have recipes left
-        if not filtered_df.empty:
-            # If no cuisines specified after filtering allergies, return all
-            if len(preferred_cuisines) == 0:
-                return filtered_df
-                
-            # Otherwise apply cuisine filter    
-            filtered_df = filtered_df[filtered_df['tags'].apply(
-                lambda tags: any(cuisine.lower() in tag.lower() for tag in tags for cuisine in preferred_cuisines)
-            )]
+        if keep.any():
+            # Apply cuisine filter to the remaining recipes (one line per tag, matched in a single scan)
+            remaining = np.flatnonzero(keep)
+            tags_text = recipe_search_text(recipes_df, 'tags').iloc[remaining]
+            cuisine_pattern = compile_cuisine_pattern(tuple(dict.fromkeys(cuisine.lower() for cuisine in preferred_cuisines)))
+            keep[remaining] = tags_text.str.contains(cuisine_pattern).to_numpy()
     
-    return filtered_df
+    if keep.all():
+        return recipes_df
+    return recipes_df[keep]
+
+# Recipe nutrient columns stored with units (like 'g' or '%') and the characters stripped from them
+RECIPE_UNIT_COLUMNS = ['Protein', 'Fibre', 'Fat_percent', 'Carbs', 'Sugars_percent', 'Salt_percent', 'Saturates_percent']
+NON_NUMERIC_CHARS = re.compile(r'[^0-9.]+')
 
+def clean_unit_columns(df, columns=RECIPE_UNIT_COLUMNS):
+    """
+    Convert unit columns to numbers, with unparseable or missing values as 0
+    
+    Columns that are already clean are left alone, so a cleaned DataFrame is returned as-is.
+    """
+    present = [col for col in columns if col in df.columns]
+    text_cols = [col for col in present if not pd.api.types.is_numeric_dtype(df[col])]
+    nan_cols = [col for col in present if col not in text_cols and df[col].hasnans]
+    if not text_cols and not nan_cols:
+        return df
+    
+    df = df.copy()
+    for col in text_cols:
+        df[col] = pd.to_numeric(df[col].astype(str).str.replace(NON_NUMERIC_CHARS, '', regex=True), errors='coerce')
+    df[text_cols + nan_cols] = df[text_cols + nan_cols].fillna(0)
+    return df
+
+# Lowercased search text kept alongside the recipe columns the allergy and cuisine filters scan
+RECIPE_SEARCH_COLUMNS = {'ingredients': '_ingredients_lc', 'tags': '_tags_lc', 'name': '_name_lc'}
+
+def recipe_search_text(recipes_df, column):
+    """
+    Lowercased text of a recipe column, one line per list item so a keyword can't match across two items.
+    Uses the column precomputed by add_recipe_search_columns when present.
+    """
+    search_col = RECIPE_SEARCH_COLUMNS[column]
+    if search_col in recipes_df.columns:
+        return recipes_df[search_col]
+    text = recipes_df[column]
+    if column != 'name':
+        text = text.map('\n'.join)
+    return text.str.lower()
+
+def add_recipe_search_columns(recipes_df):
+    """
+    Precompute the lowercased search text of the recipe columns that are present
+    """
+    for column, search_col in RECIPE_SEARCH_COLUMNS.items():
+        if column in recipes_df.columns:
+            recipes_df[search_col] = recipe_search_text(recipes_df, column)
+    return recipes_df
+
+@lru_cache(maxsize=256)
+def compile_allergen_patterns(allergies):
+    """
+    Ingredient pattern and whole-word recipe name pattern for a tuple of lowercase allergens.
+    The name pattern is None when every allergen contains whitespace.
+    """
+    ingredient_pattern = re.compile('|'.join(re.escape(allergen) for allergen in allergies))
+    
+    # Recipe names only match an allergen as a whole word
+    name_allergens = [allergen for allergen in allergies if not re.search(r'\s', allergen)]
+    name_pattern = None
+    if name_allergens:
+        name_pattern = re.compile(r'(?<!\S)(?:' + '|'.join(re.escape(allergen) for allergen in name_allergens) + r')(?!\S)')
+    return ingredient_pattern, name_pattern
+
+@lru_cache(maxsize=256)
+def compile_cuisine_pattern(cuisines):
+    """
+    Pattern matching any of a tuple of lowercase cuisines
+    """
+    return re.compile('|'.join(re.escape(cuisine) for cuisine in cuisines))
+
+@st.cache_resource(show_spinner=False)
 def load_recipe_details():
     """
     Load the recipe_details.csv dataset
@@ -341,11 +517,12 @@ def load_recipe_details():
     try:
         recipe_details = pd.read_csv('attached_assets/recipe_details.csv')
         recipe_details.columns = recipe_details.columns.str.strip()
-        return recipe_details
+        return clean_unit_columns(recipe_details)
     except Exception as e:
         print(f"Error loading recipe details: {e}")
         return pd.DataFrame()
 
+@st.cache_resource(show_spinner=False)
 def load_food_data():
     """
     Load the food dataset
@@ -358,9 +535,15 @@ def load_food_data():
         numeric_cols = ['Calories', 'Total Fat', 'Saturated Fat', 'Monounsaturated Fat', 
                        'Polyunsaturated Fat', 'Carbs', 'Sugar', 'Protein', 'Dietary Fiber', 
                        'Cholesterol', 'Sodium', 'Water']
-        for col in numeric_cols:
-            if col in food_data.columns:
-                food_data[col] = pd.to_numeric(food_data[col], errors='coerce')
+        # read_csv already parsed clean columns as numbers; only coerce the ones that came back as text
+        numeric_cols = [col for col in numeric_cols
+                        if col in food_data.columns and not pd.api.types.is_numeric_dtype(food_data[col])]
+        if numeric_cols:
+            food_data[numeric_cols] = food_data[numeric_cols].apply(pd.to_numeric, errors='coerce')
+        
+        # Lowercase the names once for case-insensitive searches
+        if 'Food Name' in food_data.columns:
+            food_data['_name_lc'] = food_data['Food Name'].str.lower()
         
         return food_data
     except Exception as e:
@@ -369,6 +552,7 @@ def load_food_data():
         return pd.DataFrame()
 
 #added by tushar 6
+@st.cache_resource(show_spinner=False)
 def load_exercise_data():
     """
     Load the exercise dataset
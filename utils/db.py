@@ -10,7 +10,14 @@ MONGO_URI = st.secrets["MONGO_URI"]
 
 # Connect immediately when importing
 try:
-    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
+    # One Streamlit server needs only a small pool; zlib compression needs no extra package
+    client = MongoClient(
+        MONGO_URI,
+        serverSelectionTimeoutMS=5000,
+        maxPoolSize=10,
+        minPoolSize=1,
+        compressors="zlib"
+    )
     client.admin.command('ping')
     print("✅ Mongo connected!")
 
@@ -20,7 +27,28 @@ try:
     meal_plans_collection = db["meal_plans"]
     journal_collection = db["journal_logs"]
 
+    # Journal history is read per user, newest first
+    journal_collection.create_index([("user_id", 1), ("_id", -1)])
+
+    # System logs are filtered by type and read newest first; unfiltered reads use the timestamp index
+    logs_collection.create_index([("type", 1), ("timestamp", -1)])
+    logs_collection.create_index([("timestamp", -1)])
+
+    # The latest meal plan is looked up per user
+    meal_plans_collection.create_index([("user_id", 1), ("created_at", -1)])
+
+    # Users are looked up by username at login and paged by _id on the admin dashboard
+    users_collection.create_index("username")
+    users_collection.create_index([("is_admin", 1), ("_id", 1)])
+
 except Exception as e:
     print(f"❌ Mongo connection failed: {e}")
     st.error("Database not reachable. Please check your connection settings.")
     st.stop()
+
+
+# Emails should be unique, but older data may contain duplicates; don't block startup on it
+try:
+    users_collection.create_index("email", unique=True)
+except Exception as e:
+    print(f"⚠️ Could not create unique email index: {e}")
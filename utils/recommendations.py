@@ -1,17 +1,19 @@
 import itertools
 import pandas as pd
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 from utils.data_processing import calculate_calorie_needs, calculate_macros, filter_foods_by_preference
 import logging
-from sklearn.preprocessing import MinMaxScaler
-from utils.data_processing import filter_recipes_by_allergies_and_cuisines,load_optimized_meals
+from utils.data_processing import filter_recipes_by_allergies_and_cuisines,load_optimized_meals,clean_unit_columns
 from utils.user_management import save_meal_plan
 #added by tushar start
 from sklearn.neighbors import NearestNeighbors
 from sklearn.preprocessing import StandardScaler
 import os
 #end
+
+# Recipe columns needed to filter recipes and build a meal plan
+MEAL_PLAN_COLUMNS = ['name', 'ingredients', 'tags', 'meal_type', 'calories', 'protein', 'carbs', 'fat']
+
 def load_user_ratings():
     """
     Load user-exercise ratings from CSV or initialize empty DataFrame.
@@ -28,6 +30,41 @@ def save_user_ratings(ratings_df):
 
 #end
 
+def cosine_scores(matrix, vector):
+    """
+    Cosine similarity of every row of matrix to vector (0 for all-zero rows, like sklearn)
+    """
+    dots = matrix @ vector
+    norms = np.sqrt(np.einsum('ij,ij->i', matrix, matrix) * np.vdot(vector, vector))
+    return np.divide(dots, norms, out=np.zeros_like(dots, dtype=float), where=norms > 0)
+
+def min_max_scale(matrix, vector):
+    """
+    Min-max scale matrix column-wise and apply the same scaling to vector (like MinMaxScaler)
+    """
+    low = np.nanmin(matrix, axis=0)
+    span = np.nanmax(matrix, axis=0) - low
+    span[span == 0] = 1
+    return (matrix - low) / span, (vector - low) / span
+
+def top_k_indices(scores, k):
+    """
+    Positions of the k highest scores, best first, without sorting the whole array
+    """
+    if k < len(scores):
+        top = np.argpartition(-scores, k)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind='stable')]
+
+def numeric_column(df, col):
+    """
+    Column values as a float array, or zeros when the column is missing
+    """
+    if col in df.columns:
+        return df[col].to_numpy(dtype=float)
+    return np.zeros(len(df))
+
 def generate_meal_plan_with_cosine_similarity(user_data, recipes_df, days,meals_per_day):
     """
     Generate a meal plan using cosine similarity to find the best matching meals
@@ -65,7 +102,9 @@ def generate_meal_plan_with_cosine_similarity(user_data, recipes_df, days,meals_
     
     
     
-    recipes_df = load_optimized_meals()
+    # Reuse the recipes already held in memory; only read the parquet file when they were not passed in
+    if recipes_df is None or recipes_df.empty or not set(MEAL_PLAN_COLUMNS).issubset(recipes_df.columns):
+        recipes_df = load_optimized_meals(MEAL_PLAN_COLUMNS)
     print(f"Loaded {recipes_df.shape[0]} recipes from optimized meals")
     
 
@@ -78,30 +117,21 @@ def generate_meal_plan_with_cosine_similarity(user_data, recipes_df, days,meals_
         return {"error": "No recipes available that match your preferences. Try adjusting filters."}
      
      # Build similarity-based week plan
+    features = ['calories','fat','carbs','protein']
+    user_vector = np.array([calorie_goal, fat_goal, carbs_goal, protein_goal], dtype=float)
     week_plan = {}
     for meal_type in ['breakfast', 'lunch', 'dinner']:
         meal_df = filtered_df[filtered_df['meal_type'] == meal_type]
         if meal_df.empty:
             return {"error": f"No {meal_type} recipes found. Adjust preferences."}
         print(f"Filtered recipes: {meal_df.shape[0]} recipes available")
-        scaler = MinMaxScaler()
-        features = ['calories','fat','carbs','protein']
-
-        # Fit on the underlying values array
-        scaler = MinMaxScaler()
-        scaler.fit(meal_df[features].values)
 
-        # Transform meals
-        nutrition_scaled = scaler.transform(meal_df[features].values)
+        # Scale meals and the user vector to this meal type's nutrient ranges
+        nutrition_scaled, user_scaled = min_max_scale(meal_df[features].to_numpy(dtype=float), user_vector)
 
-        # Make your user vector as a 2D array of the same shape
-        user_vector = np.array([[calorie_goal, fat_goal, carbs_goal, protein_goal]])
-        user_scaled = scaler.transform(user_vector)
-
-        similarity = cosine_similarity(user_scaled, nutrition_scaled)[0]
-        meal_df = meal_df.copy()
-        meal_df['similarity'] = similarity
-        week_plan[meal_type] = meal_df.sort_values('similarity', ascending=False).head(days).reset_index(drop=True)
+        similarity = cosine_scores(nutrition_scaled, user_scaled)
+        top = top_k_indices(similarity, days)
+        week_plan[meal_type] = meal_df.iloc[top].reset_index(drop=True).assign(similarity=similarity[top])
 
     # Assemble final plan structure
     meal_plan = {
@@ -119,6 +149,7 @@ def generate_meal_plan_with_cosine_similarity(user_data, recipes_df, days,meals_
         }
 
         total_calories = total_protein = total_carbs = total_fat = 0
+        meal_totals = []  # Calories per meal, kept in step with day_plan["meals"]
 
         for meal_num, meal_type in enumerate(['breakfast', 'lunch', 'dinner'], 1):
             # Select meal based on similarity, rotate daily
@@ -138,6 +169,7 @@ def generate_meal_plan_with_cosine_similarity(user_data, recipes_df, days,meals_
             }
 
             day_plan["meals"].append(meal)
+            meal_totals.append(meal_rec['calories'])
 
             # Update running totals
             total_calories += meal_rec['calories']
@@ -173,8 +205,9 @@ def generate_meal_plan_with_cosine_similarity(user_data, recipes_df, days,meals_
                         "fat": extra_meal_rec['fat'] * fraction
                     }
 
-                    lowest_meal = min(day_plan["meals"], key=lambda m: sum(f["calories"] for f in m["foods"]))
-                    lowest_meal["foods"].append(extra_food)
+                    lowest_idx = meal_totals.index(min(meal_totals))
+                    day_plan["meals"][lowest_idx]["foods"].append(extra_food)
+                    meal_totals[lowest_idx] += extra_food['calories']
 
                     total_calories += extra_food['calories']
                     total_protein += extra_food['protein']
@@ -193,8 +226,9 @@ def generate_meal_plan_with_cosine_similarity(user_data, recipes_df, days,meals_
                     "fat": extra_meal_rec['fat']
                 }
 
-                lowest_meal = min(day_plan["meals"], key=lambda m: sum(f["calories"] for f in m["foods"]))
-                lowest_meal["foods"].append(extra_food)
+                lowest_idx = meal_totals.index(min(meal_totals))
+                day_plan["meals"][lowest_idx]["foods"].append(extra_food)
+                meal_totals[lowest_idx] += extra_food['calories']
 
                 total_calories += extra_meal_rec['calories']
                 total_protein += extra_meal_rec['protein']
@@ -254,55 +288,35 @@ def recommend_foods_by_goal(user_data, recipe_data, num_recommendations=10):
     - List of recommended recipes (dicts with name, calories, protein, carbs, fat, image_url, and link)
     """
     # No dietary filtering for now (can be added if needed)
-    filtered_recipes = recipe_data.copy()
-    if filtered_recipes.empty:
+    if recipe_data.empty:
         return []
 
-    # Remove any non-numeric characters (like 'g', '%', etc.)
-    unit_cols = ['Protein', 'Fibre', 'Fat_percent', 'Carbs', 'Sugars_percent','Salt_percent','Saturates_percent']
-    for col in unit_cols:
-        if col in filtered_recipes.columns:
-            filtered_recipes[col] = (
-                filtered_recipes[col]
-                .astype(str)
-                .str.replace(r'[^0-9.]+', '', regex=True)
-            )
-            filtered_recipes[col] = pd.to_numeric(filtered_recipes[col], errors='coerce').fillna(0)
+    # Remove any non-numeric characters (like 'g', '%', etc.); a no-op for data from load_recipe_details
+    filtered_recipes = clean_unit_columns(recipe_data)
 
     goal = user_data.get('goal', '').lower()
-    scores = []
-    for _, recipe in filtered_recipes.iterrows():
-        score = 0
-        # Skip recipes with missing data
-        if pd.isna(recipe.get('Calories', 0)) or recipe.get('Calories', 0) <= 0:
-            scores.append(-1)
-            continue
+    calories = numeric_column(filtered_recipes, 'Calories')
+    protein = numeric_column(filtered_recipes, 'Protein')
+    fibre = numeric_column(filtered_recipes, 'Fibre')
+    calories_safe = np.maximum(calories, 1)
+    with np.errstate(invalid='ignore'):
         # Weight Loss: Favor high protein, low calories, high fibre
         if 'weight loss' in goal:
-            protein_per_calorie = recipe.get('Protein', 0) / max(recipe.get('Calories', 1), 1)
-            fibre_per_calorie = recipe.get('Fibre', 0) / max(recipe.get('Calories', 1), 1)
-            score = (protein_per_calorie * 5) + (fibre_per_calorie * 3) - (recipe.get('Sugars_percent', 0) * 0.1)
+            sugars = numeric_column(filtered_recipes, 'Sugars_percent')
+            scores = (protein / calories_safe * 5) + (fibre / calories_safe * 3) - (sugars * 0.1)
         # Weight Gain: Favor high calories, balanced macros
         elif 'weight gain' in goal:
-            calorie_density = recipe.get('Calories', 0) / 100
-            protein_ratio = recipe.get('Protein', 0) / max(recipe.get('Calories', 1), 1)
-            score = (calorie_density * 3) + (protein_ratio * 2)
+            scores = (calories / 100 * 3) + (protein / calories_safe * 2)
         # Muscle Gain: Favor high protein and moderate calories
         elif 'muscle gain' in goal:
-            protein_content = recipe.get('Protein', 0)
-            protein_ratio = protein_content / max(recipe.get('Calories', 1), 1)
-            score = (protein_content * 2) + (protein_ratio * 5)
+            scores = (protein * 2) + (protein / calories_safe * 5)
         # Maintain Weight: Favor balanced, nutrient-dense recipes
         else:
-            nutrition_density = (
-                recipe.get('Protein', 0) +
-                recipe.get('Fibre', 0) * 2
-            ) / max(recipe.get('Calories', 1), 1)
-            score = nutrition_density * 5
-        scores.append(score)
-    filtered_recipes_with_scores = filtered_recipes.copy()
-    filtered_recipes_with_scores['score'] = scores
-    top_recommendations = filtered_recipes_with_scores.sort_values('score', ascending=False).head(num_recommendations)
+            scores = (protein + fibre * 2) / calories_safe * 5
+        # Skip recipes with missing data
+        scores = np.where(calories > 0, scores, -1)
+    top = top_k_indices(scores, num_recommendations)
+    top_recommendations = filtered_recipes.iloc[top].assign(score=scores[top])
     recommendations = []
     for _, recipe in top_recommendations.iterrows():
         if recipe.get('score', 0) > 0:
@@ -343,7 +357,9 @@ def recommend_exercises(user_data, exercise_data, num_recommendations=10):
     - num_recommendations: Total number of exercises to recommend
     
     Returns:
-    - Dict with recommended exercises by category (Cardio, Strength, Flexibility)
+    - Dict with a 'df' DataFrame of recommended exercises, one row per exercise,
+      tagged with its 'category' (Cardio, Strength, Flexibility) and muscle 'bucket'
+      (upper, lower, core), or a dict with an 'error' message
     """
     if exercise_data.empty:
         return {"error": "No exercise data available"}
@@ -624,7 +640,25 @@ def recommend_exercises(user_data, exercise_data, num_recommendations=10):
                     }
                     recommendations[category].append(exercise_dict)
     
-    return recommendations
+    # Flatten into a single tagged DataFrame
+    rec_df = pd.DataFrame(
+        [dict(exercise, category=category) for category, exercises in recommendations.items() for exercise in exercises],
+        columns=['category', 'name', 'type', 'main_muscle', 'equipment', 'level', 'description',
+                 'rating', 'rating_desc', 'sets', 'predicted_rating']
+    )
+    
+    # Bucket by muscle group; anything unmatched is treated as upper body
+    muscles = rec_df['main_muscle'].astype(str).str.lower()
+    rec_df['bucket'] = np.select(
+        [
+            muscles.str.contains('|'.join(muscle_groups[group]).lower(), regex=True)
+            for group in ('Upper Body', 'Lower Body', 'Core')
+        ],
+        ['upper', 'lower', 'core'],
+        default='upper'
+    )
+    
+    return {"df": rec_df}
 
 
 def calculate_body_fat_percentage(user_data):
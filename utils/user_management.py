@@ -1,5 +1,6 @@
 import bcrypt
 from bson.objectid import ObjectId 
+from pymongo.errors import DuplicateKeyError
 from utils.db import users_collection, meal_plans_collection
 from datetime import datetime
 
@@ -9,11 +10,40 @@ def authenticate_user(username, password):
         return False, None, None
 
     if bcrypt.checkpw(password.encode('utf-8'), user["password"]):
+        backfill_progress_timestamps(user)
         is_admin = user.get("is_admin", False)  # Default False if missing
         return True, str(user["_id"]), is_admin
     else:
         return False, None, None
     
+def parse_progress_timestamp(timestamp):
+    """
+    Return a progress entry timestamp as a datetime (legacy entries stored a formatted string), or None if unreadable.
+    """
+    if isinstance(timestamp, str):
+        try:
+            return datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return None
+    return timestamp
+
+def backfill_progress_timestamps(user):
+    """
+    Convert legacy string timestamps in progress_history to datetime objects, once.
+    Malformed strings are left as they are so they can't block login.
+    """
+    history = user.get("progress_history") or []
+    converted = False
+    for entry in history:
+        if isinstance(entry.get("timestamp"), str):
+            parsed = parse_progress_timestamp(entry["timestamp"])
+            if parsed is not None:
+                entry["timestamp"] = parsed
+                converted = True
+
+    if converted:
+        users_collection.update_one({"_id": user["_id"]}, {"$set": {"progress_history": history}})
+
 def register_user(username, email, password):
     existing_user = users_collection.find_one({"username": username})
     if existing_user:
@@ -45,7 +75,11 @@ def register_user(username, email, password):
         "health_status": ""
     }
 
-    result = users_collection.insert_one(new_user)
+    # Emails have a unique index
+    try:
+        result = users_collection.insert_one(new_user)
+    except DuplicateKeyError:
+        return False, "Email already registered.", None
     return True, "User registered successfully!", str(result.inserted_id)
 
 def update_user(user_id, data):
@@ -87,9 +121,9 @@ def delete_user(user_id):
     except Exception as e:
         return False, f"Error deleting user: {str(e)}"
 
-def get_user(user_id):
+def get_user(user_id, projection=None):
     try:
-        user = users_collection.find_one({"_id": ObjectId(user_id)})
+        user = users_collection.find_one({"_id": ObjectId(user_id)}, projection)
         if user:
             user["_id"] = str(user["_id"])  # Make ObjectId JSON serializable
         return user
@@ -97,6 +131,33 @@ def get_user(user_id):
         print(f"Error getting user: {str(e)}")
         return None
 
+def summarize_progress(progress_history):
+    """
+    Summarise a progress history so pages can read it without scanning every entry.
+    """
+    if not progress_history:
+        return None
+
+    first_entry = progress_history[0]
+    last_entry = progress_history[-1]
+
+    # Legacy entries stored the timestamp as a formatted string
+    first_time = parse_progress_timestamp(first_entry["timestamp"])
+    last_time = parse_progress_timestamp(last_entry["timestamp"])
+    days = (last_time - first_time).total_seconds() / 86400 if first_time and last_time else 0
+    weekly_change = (last_entry["weight"] - first_entry["weight"]) * 7.0 / days if days >= 1 else None
+
+    recent_weights = [entry["weight"] for entry in progress_history[-7:]]
+
+    return {
+        "entries": len(progress_history),
+        "starting_weight": first_entry["weight"],
+        "current_weight": last_entry["weight"],
+        "weekly_change": weekly_change,
+        "last_weight_ma": sum(recent_weights) / len(recent_weights),
+        "updated_at": datetime.now()
+    }
+
 def update_user_progress(user_id, weight):
     try:
         user = users_collection.find_one({"_id": ObjectId(user_id)})
@@ -108,7 +169,7 @@ def update_user_progress(user_id, weight):
         health_status = "Healthy" if 18.5 <= bmi < 24.9 else "Underweight" if bmi < 18.5 else "Overweight" if 24.9 <= bmi < 29.9 else "Obese"
 
         progress_entry = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": datetime.now(),
             "weight": float(weight),
             "bmi": bmi
         }
@@ -120,7 +181,8 @@ def update_user_progress(user_id, weight):
                 "$set": {
                     "weight": float(weight),
                     "bmi": bmi,
-                    "health_status": health_status
+                    "health_status": health_status,
+                    "summary": summarize_progress((user.get("progress_history") or []) + [progress_entry])
                 }
             }
         )
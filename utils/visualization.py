@@ -333,12 +333,12 @@ def create_exercise_distribution_chart(recommendations):
     Create a pie chart showing distribution of exercise types
     
     Parameters:
-    - recommendations: Dict containing exercise recommendations by category
+    - recommendations: DataFrame of exercise recommendations with a 'category' column
     
     Returns:
     - Plotly figure object
     """
-    if not recommendations:
+    if recommendations is None or recommendations.empty:
         # Return empty figure if no data
         fig = go.Figure()
         fig.update_layout(
@@ -347,14 +347,10 @@ def create_exercise_distribution_chart(recommendations):
         )
         return fig
     
-    # Count exercises by category
-    categories = []
-    counts = []
-    
-    for category, exercises in recommendations.items():
-        if exercises:  # Only include non-empty categories
-            categories.append(category)
-            counts.append(len(exercises))
+    # Count exercises by category (only non-empty categories appear)
+    category_counts = recommendations['category'].value_counts(sort=False)
+    categories = category_counts.index.tolist()
+    counts = category_counts.tolist()
     
     # Create the pie chart
     fig = go.Figure(data=[go.Pie(
@@ -372,3 +368,21 @@ def create_exercise_distribution_chart(recommendations):
     )
     
     return fig
+
+def display_dataframe_quickly(df, max_rows=5000, **st_dataframe_kwargs):
+    """
+    Display a large dataframe by only sending a window of rows to the browser
+    
+    Parameters:
+    - df: DataFrame to display
+    - max_rows: Maximum number of rows shown at once; a slider picks the window
+    - st_dataframe_kwargs: Extra keyword arguments passed to st.dataframe
+    """
+    n_rows = len(df)
+    if n_rows <= max_rows:
+        st.dataframe(df, **st_dataframe_kwargs)
+        return
+    
+    start_row = st.slider('Select starting row', 0, n_rows - max_rows, 0)
+    st.dataframe(df.iloc[start_row:start_row + max_rows], **st_dataframe_kwargs)
+    st.caption(f'Showing rows {start_row + 1}-{start_row + max_rows} of {n_rows}')